@@ -3,68 +3,232 @@
 from __future__ import annotations
 
 import glob
+import io
 import json
+import os
+import random
 import re
+import threading
 from datetime import date
 from pathlib import Path
 
 import streamlit as st
 from dotenv import load_dotenv
-
-
+from PIL import Image
+
+# Citation markers like [source: chunk_xxx], plus the runs of spaces they leave
+_CITATION_RE = re.compile(r'\s*\[source:\s*\w+\]\.?')
+_MULTISPACE_RE = re.compile(r'  +')
+
+# Leading bullet markers (and the whitespace around them) or trailing whitespace
+_BULLET_RE = re.compile(r'^[^\S\n]*[•\-*]*[^\S\n]*|[^\S\n]+$', re.MULTILINE)
+
+# Character limits shown under each channel's body
+_MAX_CHARS = {"linkedin": 3000, "facebook": 500, "email": 1500, "web": 500}
+
+# Badge class for each 0-10 score: low below 4, mid below 7, high otherwise
+_SCORE_CLASSES = ("score-low",) * 4 + ("score-mid",) * 3 + ("score-high",) * 4
+
+# Corpus documents larger than this are shown as truncated plain text
+_CORPUS_PREVIEW_LIMIT = 64 * 1024
+
+# Custom CSS for tabs and score badges
+_CSS = """
+<style>
+.stTabs [data-baseweb="tab-list"] {
+    gap: 24px;
+}
+.stTabs [data-baseweb="tab"] {
+    padding: 10px 20px;
+}
+.score-badge {
+    display: inline-block;
+    padding: 4px 12px;
+    border-radius: 12px;
+    font-weight: bold;
+}
+.score-high { background: #d4edda; color: #155724; }
+.score-mid { background: #fff3cd; color: #856404; }
+.score-low { background: #f8d7da; color: #721c24; }
+.score-na { background: #e9ecef; color: #495057; }
+</style>
+"""
+
+
+@st.cache_data(max_entries=512, show_spinner=False)
 def strip_citations(text: str) -> str:
     """Remove citation markers from text for clean copy.
 
-    Removes patterns like [source: chunk_xxx] from the text.
+    Removes patterns like [source: chunk_xxx] from the text. Results are
+    memoized since the same body/CTA strings are re-cleaned on every rerun.
     """
     if not text:
         return text
     # Remove [source: chunk_xxx] patterns
-    cleaned = re.sub(r'\s*\[source:\s*\w+\]\.?', '', text)
+    cleaned = _CITATION_RE.sub('', text)
     # Clean up any double spaces left behind
-    cleaned = re.sub(r'  +', ' ', cleaned)
+    cleaned = _MULTISPACE_RE.sub(' ', cleaned)
     return cleaned.strip()
 
 
-def get_clean_copy_text(channel_content: dict, channel: str) -> str:
-    """Generate clean, copy-ready text without citations."""
+def get_clean_copy_text(
+    channel_content: dict,
+    channel: str,
+    clean_body: str | None = None,
+    clean_cta: str | None = None,
+) -> str:
+    """Generate clean, copy-ready text without citations.
+
+    Callers that already stripped the body and CTA can pass them in to
+    avoid scanning the same text twice.
+    """
+    if clean_body is None:
+        clean_body = strip_citations(channel_content.get("body") or "")
+    if clean_cta is None:
+        clean_cta = strip_citations(channel_content.get("cta") or "")
+    return _clean_copy_text(
+        channel_content.get("headline"),
+        channel_content.get("subject_line"),
+        clean_body,
+        clean_cta,
+    )
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _clean_copy_text(
+    headline: str | None,
+    subject_line: str | None,
+    clean_body: str,
+    clean_cta: str,
+) -> str:
+    """Build the copy-ready text from hashable fields so it can be cached."""
     parts = []
 
-    if channel_content.get("headline"):
-        parts.append(channel_content["headline"])
+    if headline:
+        parts.append(headline)
         parts.append("")  # Empty line
 
-    if channel_content.get("subject_line"):
-        parts.append(f"Subject: {channel_content['subject_line']}")
+    if subject_line:
+        parts.append(f"Subject: {subject_line}")
         parts.append("")
 
-    if channel_content.get("body"):
-        parts.append(strip_citations(channel_content["body"]))
+    if clean_body:
+        parts.append(clean_body)
         parts.append("")
 
-    if channel_content.get("cta"):
-        parts.append(strip_citations(channel_content["cta"]))
+    if clean_cta:
+        parts.append(clean_cta)
 
     return "\n".join(parts).strip()
 
 
+def build_display_cache(content: dict) -> dict:
+    """Precompute the cleaned, display-ready fields for each channel.
+
+    Built once when a result is stored so reruns only read from it.
+    """
+    display_cache = {}
+    for channel, channel_content in content.items():
+        clean_body = strip_citations(channel_content.get("body", ""))
+        clean_cta = strip_citations(channel_content.get("cta", ""))
+        char_count = len(clean_body)
+        max_chars = _MAX_CHARS.get(channel, 3000)
+        display_cache[channel] = {
+            "clean_body": clean_body,
+            "clean_cta": clean_cta,
+            "char_count": char_count,
+            "max_chars": max_chars,
+            "count_color": "green" if char_count <= max_chars else "red",
+            "clean_copy": get_clean_copy_text(
+                channel_content, channel, clean_body=clean_body, clean_cta=clean_cta
+            ),
+        }
+    return display_cache
+
+
+def compress_image(raw_bytes: bytes, max_width: int = 1200) -> bytes:
+    """Downscale and re-encode a generated image as WEBP for display.
+
+    Falls back to the original bytes if the image cannot be decoded.
+    """
+    try:
+        img = Image.open(io.BytesIO(raw_bytes))
+        if img.width > max_width:
+            img.thumbnail((max_width, max_width))
+        buf = io.BytesIO()
+        img.save(buf, format="WEBP", quality=85)
+        return buf.getvalue()
+    except Exception:
+        return raw_bytes
+
+
+def score_badge(score: int | None) -> str:
+    """Render a 0-10 critic score as a badge; a missing score shows as n/a."""
+    if score is None:
+        return '<span class="score-na">n/a</span>'
+    return f'<span class="{_SCORE_CLASSES[min(max(score, 0), 10)]}">{score}/10</span>'
+
+
 def parse_urls(text: str) -> list:
     """Parse URLs from text input (format: Label | URL, one per line)."""
     if not text or not text.strip():
         return []
 
     urls = []
-    for line in text.strip().split("\n"):
+    append = urls.append
+    for line in text.splitlines():
         line = line.strip()
         if not line:
             continue
         if "|" in line:
-            label, url = line.split("|", 1)
-            urls.append({"label": label.strip(), "url": url.strip()})
+            label, _, url = line.partition("|")
+            append({"label": label.strip(), "url": url.strip()})
         elif line.startswith("http"):
-            urls.append({"label": "Link", "url": line.strip()})
+            append({"label": "Link", "url": line})
     return urls
 
+
+def parse_key_messages(text: str) -> list:
+    """Parse key messages from text input (one per line, bullets optional)."""
+    return [m for m in _BULLET_RE.sub('', text).split("\n") if m]
+
+
+@st.cache_data(show_spinner=False)
+def _list_corpus(dir_mtime: float) -> list[str]:
+    """List corpus documents, cached until the corpus directory changes."""
+    return sorted(glob.glob("corpus/*.md"))
+
+
+@st.cache_data(show_spinner=False)
+def _read_corpus_file(path: str, mtime: float) -> str:
+    """Read a corpus document, cached until the file's mtime changes."""
+    return Path(path).read_text(encoding="utf-8")
+
+
+@st.cache_resource(show_spinner=False)
+def _reindex_lock() -> threading.Lock:
+    """Process-wide lock so only one corpus re-index runs at a time."""
+    return threading.Lock()
+
+
+def _prewarm() -> None:
+    """Import the pipeline stack (LangGraph, LLM clients, ChromaDB)."""
+    import src.graph  # noqa: F401
+    import src.rag  # noqa: F401
+
+
+@st.cache_resource(show_spinner=False)
+def _start_prewarm() -> threading.Thread:
+    """Start the heavy imports in the background, once per process.
+
+    By the time the user submits the form, the inline imports in main()
+    are plain sys.modules lookups instead of a cold import.
+    """
+    thread = threading.Thread(target=_prewarm, daemon=True)
+    thread.start()
+    return thread
+
+
 # Load environment variables
 load_dotenv()
 
@@ -76,28 +240,42 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+_start_prewarm()
+
 # Custom CSS
-st.markdown(
-    """
-    <style>
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 24px;
-    }
-    .stTabs [data-baseweb="tab"] {
-        padding: 10px 20px;
-    }
-    .score-badge {
-        display: inline-block;
-        padding: 4px 12px;
-        border-radius: 12px;
-        font-weight: bold;
-    }
-    .score-high { background: #d4edda; color: #155724; }
-    .score-mid { background: #fff3cd; color: #856404; }
-    .score-low { background: #f8d7da; color: #721c24; }
-    </style>
-    """,
-    unsafe_allow_html=True,
+st.markdown(_CSS, unsafe_allow_html=True)
+
+
+# Sample event data for testing
+SAMPLE_EVENTS = (
+    {
+        "title": "Zero Trust Security Webinar",
+        "description": "Join our security experts for a deep dive into Zero Trust architecture. Learn how identity-first security protects your organization from modern threats.",
+        "audience": "CISOs, Security Architects, and IT Leaders",
+        "messages": "• Identity is the new security perimeter\n• Zero Trust eliminates implicit trust\n• Protect against modern cyber threats",
+        "urls": "Register | https://example.com/register/zero-trust\nLearn More | https://example.com/events/zero-trust",
+    },
+    {
+        "title": "AI Innovation Summit 2026",
+        "description": "Explore cutting-edge AI technologies shaping the future. Features keynote speakers, hands-on workshops, and networking with industry leaders.",
+        "audience": "Tech leaders, CTOs, data scientists, and AI enthusiasts",
+        "messages": "• Discover breakthrough AI technologies\n• Network with industry innovators\n• Gain practical skills through workshops",
+        "urls": "Register | https://example.com/register/ai-summit\nAgenda | https://example.com/events/ai-summit/agenda",
+    },
+    {
+        "title": "Cloud Migration Masterclass",
+        "description": "Learn proven strategies for migrating enterprise workloads to the cloud. Our experts share best practices and common pitfalls to avoid.",
+        "audience": "IT Directors, Cloud Architects, and DevOps Engineers",
+        "messages": "• Reduce infrastructure costs by 40%\n• Improve scalability and reliability\n• Accelerate digital transformation",
+        "urls": "Register | https://example.com/register/cloud-masterclass\nResources | https://example.com/cloud-migration-guide",
+    },
+    {
+        "title": "Developer Experience Conference",
+        "description": "A full-day conference focused on improving developer productivity and satisfaction. Learn about modern tooling, workflows, and team culture.",
+        "audience": "Engineering managers, developers, and DevEx practitioners",
+        "messages": "• Boost developer productivity\n• Reduce cognitive load and friction\n• Build a culture of engineering excellence",
+        "urls": "Register | https://example.com/register/devex-conf\nSpeakers | https://example.com/devex-conf/speakers",
+    },
 )
 
 
@@ -115,27 +293,56 @@ def main():
         # Corpus management
         st.subheader("📚 Corpus")
         st.caption("Documents are persisted. Only re-index if you've added new files to `/corpus`.")
-        if st.button("🔄 Re-index Corpus", help="Re-process documents in the corpus folder"):
-            with st.spinner("Re-indexing documents..."):
+        # A click queued while the last re-index ran replays on the next
+        # rerun, so the flag set below is only cleared (popped) by that rerun
+        reindexing = st.session_state.pop("_reindexing", False)
+        reindex_lock = _reindex_lock()
+        if st.button(
+            "🔄 Re-index Corpus",
+            help="Re-process documents in the corpus folder",
+            disabled=reindexing or reindex_lock.locked(),
+        ) and not reindexing:
+            # Only one re-index at a time across all sessions
+            if not reindex_lock.acquire(blocking=False):
+                st.info("A re-index is already running.")
+            else:
+                st.session_state._reindexing = True
                 try:
-                    from src.rag import ingest_documents
+                    with st.spinner("Re-indexing documents..."):
+                        from src.rag import ingest_documents
 
-                    result = ingest_documents(force_reingest=True)
+                        result = ingest_documents(force_reingest=True)
                     st.success(f"Re-indexed: {result}")
                 except Exception as e:
                     st.error(f"Re-indexing failed: {e}")
+                finally:
+                    reindex_lock.release()
 
         # Corpus document viewer
         st.subheader("📄 Documents")
-        corpus_files = sorted(glob.glob("corpus/*.md"))
+        corpus_files = (
+            _list_corpus(os.path.getmtime("corpus")) if os.path.isdir("corpus") else []
+        )
         if corpus_files:
             for file_path in corpus_files:
-                filename = Path(file_path).name
+                filename = os.path.basename(file_path)
                 with st.expander(filename, expanded=False):
                     try:
-                        with open(file_path, "r", encoding="utf-8") as f:
-                            content = f.read()
-                        st.markdown(content)
+                        content = _read_corpus_file(
+                            file_path, os.path.getmtime(file_path)
+                        )
+                        if len(content) > _CORPUS_PREVIEW_LIMIT:
+                            # Skip markdown rendering for very large documents
+                            st.text(content[:_CORPUS_PREVIEW_LIMIT] + "\n…(truncated)")
+                            st.download_button(
+                                "Download full document",
+                                data=content,
+                                file_name=filename,
+                                mime="text/markdown",
+                                key=f"download_{filename}",
+                            )
+                        else:
+                            st.markdown(content)
                     except Exception as e:
                         st.error(f"Could not read file: {e}")
         else:
@@ -150,38 +357,6 @@ def main():
         else:
             st.caption("Trace URL will appear after generation")
 
-    # Sample event data for testing
-    import random
-    SAMPLE_EVENTS = [
-        {
-            "title": "Zero Trust Security Webinar",
-            "description": "Join our security experts for a deep dive into Zero Trust architecture. Learn how identity-first security protects your organization from modern threats.",
-            "audience": "CISOs, Security Architects, and IT Leaders",
-            "messages": "• Identity is the new security perimeter\n• Zero Trust eliminates implicit trust\n• Protect against modern cyber threats",
-            "urls": "Register | https://example.com/register/zero-trust\nLearn More | https://example.com/events/zero-trust",
-        },
-        {
-            "title": "AI Innovation Summit 2026",
-            "description": "Explore cutting-edge AI technologies shaping the future. Features keynote speakers, hands-on workshops, and networking with industry leaders.",
-            "audience": "Tech leaders, CTOs, data scientists, and AI enthusiasts",
-            "messages": "• Discover breakthrough AI technologies\n• Network with industry innovators\n• Gain practical skills through workshops",
-            "urls": "Register | https://example.com/register/ai-summit\nAgenda | https://example.com/events/ai-summit/agenda",
-        },
-        {
-            "title": "Cloud Migration Masterclass",
-            "description": "Learn proven strategies for migrating enterprise workloads to the cloud. Our experts share best practices and common pitfalls to avoid.",
-            "audience": "IT Directors, Cloud Architects, and DevOps Engineers",
-            "messages": "• Reduce infrastructure costs by 40%\n• Improve scalability and reliability\n• Accelerate digital transformation",
-            "urls": "Register | https://example.com/register/cloud-masterclass\nResources | https://example.com/cloud-migration-guide",
-        },
-        {
-            "title": "Developer Experience Conference",
-            "description": "A full-day conference focused on improving developer productivity and satisfaction. Learn about modern tooling, workflows, and team culture.",
-            "audience": "Engineering managers, developers, and DevEx practitioners",
-            "messages": "• Boost developer productivity\n• Reduce cognitive load and friction\n• Build a culture of engineering excellence",
-            "urls": "Register | https://example.com/register/devex-conf\nSpeakers | https://example.com/devex-conf/speakers",
-        },
-    ]
 
     # Main content area
     col1, col2 = st.columns([1, 1])
@@ -286,11 +461,7 @@ def main():
                 channels.append("web")
 
             # Parse key messages
-            messages = [
-                m.strip().lstrip("•-*")
-                for m in key_messages.strip().split("\n")
-                if m.strip()
-            ]
+            messages = parse_key_messages(key_messages)
 
             # Generate content with progress indicator
             try:
@@ -315,19 +486,23 @@ def main():
                     # Format iteration text
                     iter_text = f" (iteration {iteration + 1})" if iteration > 0 else ""
 
+                    # Streaming updates only refresh the label, not the log
+                    if step_info.get("partial"):
+                        progress_text = f" — {details[0]}" if details else ""
+                        status_container.update(label=f"⏳ {description}{iter_text}{progress_text}")
+                        return
+
                     # Update the status label
                     if is_done:
                         status_container.update(label=f"✓ {description}")
                     else:
                         status_container.update(label=f"⏳ {description}{iter_text}")
 
-                    # Show step details
+                    # Show step details and bullet points in a single write
                     step_display = base_step.upper()
-                    status_container.write(f"**{step_display}**{iter_text}: {description}")
-
-                    # Show bullet points for details
-                    for detail in details:
-                        status_container.write(f"  • {detail}")
+                    lines = [f"**{step_display}**{iter_text}: {description}"]
+                    lines.extend(f"- {detail}" for detail in details)
+                    status_container.markdown("\n".join(lines))
 
                     # Log this step for persistent display
                     step_log.append({
@@ -351,7 +526,19 @@ def main():
                 )
 
                 status_container.update(label="✅ Content generated successfully!", state="complete")
+                # Load images from disk once, shrunk so reruns don't resend full-size images.
+                # A missing or unreadable file only drops that channel's image.
+                images = {}
+                for channel, image in result.get("images", {}).items():
+                    if not image:
+                        continue
+                    try:
+                        images[channel] = compress_image(Path(image["path"]).read_bytes())
+                    except Exception as e:
+                        st.warning(f"Could not load the {channel} image: {e}")
+                result["images"] = images
                 st.session_state.result = result
+                st.session_state.display_cache = build_display_cache(result.get("content", {}))
                 st.session_state.step_log = step_log
 
             except Exception as e:
@@ -370,38 +557,21 @@ def main():
             claims_table = result.get("claims_table", [])
             audit_log = result.get("audit_log", {})
             images = result.get("images", {})
+            display_cache = st.session_state.get("display_cache") or build_display_cache(content)
 
             # Scorecard
             st.subheader("Quality Scorecard")
-            score_cols = st.columns(3)
-
-            with score_cols[0]:
-                brand_score = scorecard.get("brand_voice_score", 0)
-                score_class = (
-                    "score-high"
-                    if brand_score >= 7
-                    else "score-mid" if brand_score >= 4 else "score-low"
-                )
-                st.markdown(
-                    f"**Brand Voice:** <span class='{score_class}'>{brand_score}/10</span>",
-                    unsafe_allow_html=True,
-                )
-
-            with score_cols[1]:
-                cta_score = scorecard.get("cta_clarity_score", 0)
-                score_class = (
-                    "score-high"
-                    if cta_score >= 7
-                    else "score-mid" if cta_score >= 4 else "score-low"
-                )
-                st.markdown(
-                    f"**CTA Clarity:** <span class='{score_class}'>{cta_score}/10</span>",
-                    unsafe_allow_html=True,
-                )
-
-            with score_cols[2]:
-                iterations = scorecard.get("iterations", 0)
-                st.markdown(f"**Iterations:** {iterations}")
+            iterations = scorecard.get("iterations", 0)
+            # Single HTML fragment instead of one markdown call per column
+            st.html(
+                f"""
+                <div style="display: flex; gap: 32px;">
+                    <div><b>Brand Voice:</b> {score_badge(scorecard.get("brand_voice_score"))}</div>
+                    <div><b>CTA Clarity:</b> {score_badge(scorecard.get("cta_clarity_score"))}</div>
+                    <div><b>Iterations:</b> {iterations}</div>
+                </div>
+                """
+            )
 
             st.divider()
 
@@ -411,9 +581,7 @@ def main():
 
                 for tab, (channel, channel_content) in zip(tabs, content.items()):
                     with tab:
-                        # Get clean content for display
-                        clean_body = strip_citations(channel_content.get("body", ""))
-                        clean_cta = strip_citations(channel_content.get("cta", ""))
+                        display = display_cache[channel]
 
                         if channel_content.get("headline"):
                             st.markdown(f"**Headline:** {channel_content['headline']}")
@@ -426,24 +594,22 @@ def main():
                         st.markdown("**Body:**")
                         st.text_area(
                             "Content",
-                            value=clean_body,
+                            value=display["clean_body"],
                             height=200,
                             key=f"body_{channel}",
                             label_visibility="collapsed",
                         )
 
                         # Character count
-                        char_count = len(clean_body)
-                        max_chars = {"linkedin": 3000, "facebook": 500, "email": 1500, "web": 500}.get(channel, 3000)
-                        count_color = "green" if char_count <= max_chars else "red"
-                        st.caption(f":{count_color}[{char_count} / {max_chars} characters]")
+                        st.caption(
+                            f":{display['count_color']}[{display['char_count']} / {display['max_chars']} characters]"
+                        )
 
-                        st.markdown(f"**CTA:** {clean_cta}")
+                        st.markdown(f"**CTA:** {display['clean_cta']}")
 
                         # Copy-ready content in a code block
-                        clean_copy = get_clean_copy_text(channel_content, channel)
                         with st.expander("📋 Copy-Ready Content", expanded=False):
-                            st.code(clean_copy, language=None)
+                            st.code(display["clean_copy"], language=None)
                             st.caption("Select all and copy the text above")
 
                         # Display generated image for this channel
@@ -451,7 +617,7 @@ def main():
                             st.divider()
                             st.markdown("**Generated Image:**")
                             try:
-                                # Images are stored as raw bytes
+                                # Images are stored as compressed WEBP bytes
                                 st.image(
                                     images[channel],
                                     caption=f"{channel.upper()} Header Image",
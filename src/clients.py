@@ -0,0 +1,48 @@
+"""Shared API clients, created once per process.
+
+The SDKs are imported on first use rather than at module import, so
+importing the pipeline doesn't pay for google-genai (or openai) until a
+node actually needs a client.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from google import genai
+    from openai import OpenAI
+
+_lock = threading.Lock()
+_openai_client: OpenAI | None = None
+_genai_clients: dict[str, genai.Client] = {}
+
+
+def get_openai_client() -> OpenAI:
+    """Get the shared OpenAI client, creating it on first use.
+
+    Reusing one client keeps its connection pool (and keep-alive
+    connections) across node invocations and pipeline iterations.
+    """
+    global _openai_client
+    if _openai_client is None:
+        with _lock:
+            if _openai_client is None:
+                from openai import OpenAI
+
+                _openai_client = OpenAI()
+    return _openai_client
+
+
+def get_genai_client(api_key: str) -> genai.Client:
+    """Get the shared Gemini client for an API key, creating it on first use."""
+    client = _genai_clients.get(api_key)
+    if client is None:
+        with _lock:
+            client = _genai_clients.get(api_key)
+            if client is None:
+                from google import genai
+
+                client = _genai_clients[api_key] = genai.Client(api_key=api_key)
+    return client
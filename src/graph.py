@@ -2,17 +2,21 @@
 
 from __future__ import annotations
 
+import functools
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from secrets import token_hex
 from typing import Callable, Optional
 
 from langgraph.graph import END, StateGraph
 
 from .nodes import (
-    critic_node,
     draft_node,
     export_node,
     generate_images_node,
     retrieve_node,
-    verify_node,
+    review_node,
 )
 from .schemas import ContentGeneratorState
 
@@ -22,11 +26,18 @@ PIPELINE_STEPS = {
     "draft": "Writing content for selected channels...",
     "critic": "Evaluating brand voice alignment and CTA clarity...",
     "verify": "Verifying factual claims against source documents...",
+    "review": "Reviewing drafts for brand voice and factual accuracy...",
     "generate_images": "Generating marketing images with Imagen 3...",
     "export": "Preparing final output...",
 }
 
 
+@functools.lru_cache(maxsize=32)
+def _join_upper(channels: tuple[str, ...]) -> str:
+    """Join channel names as an uppercase, comma-separated label."""
+    return ", ".join(ch.upper() for ch in channels)
+
+
 def get_step_details(step: str, state: ContentGeneratorState, after: bool = False) -> dict:
     """Get detailed step information for UI display.
 
@@ -43,8 +54,8 @@ def get_step_details(step: str, state: ContentGeneratorState, after: bool = Fals
 
     if step == "retrieve":
         if after:
-            brand_count = len(state.get("brand_chunks", []))
-            product_count = len(state.get("product_chunks", []))
+            brand_count = len(state.get("brand_chunks", {}).get("ids", []))
+            product_count = len(state.get("product_chunks", {}).get("ids", []))
             return {
                 "description": "Retrieved relevant documents from corpus",
                 "details": [
@@ -62,7 +73,7 @@ def get_step_details(step: str, state: ContentGeneratorState, after: bool = Fals
         }
 
     elif step == "draft":
-        channel_list = ", ".join(ch.upper() for ch in channels)
+        channel_list = _join_upper(tuple(channels))
         if after:
             return {
                 "description": f"Drafted content for {len(channels)} channel(s)",
@@ -118,11 +129,8 @@ def get_step_details(step: str, state: ContentGeneratorState, after: bool = Fals
         if after:
             drafts = state.get("drafts", {})
             total_claims = sum(len(d.claims) for d in drafts.values())
-            supported = sum(
-                sum(1 for c in d.claims if c.is_supported)
-                for d in drafts.values()
-            )
-            unsupported = total_claims - supported
+            unsupported = state.get("unsupported_count", 0)
+            supported = total_claims - unsupported
             status = "✅ All claims verified" if unsupported == 0 else f"⚠️ {unsupported} unsupported claim(s)"
             return {
                 "description": f"Verification complete: {status}",
@@ -150,7 +158,7 @@ def get_step_details(step: str, state: ContentGeneratorState, after: bool = Fals
             return {
                 "description": f"Generated {count} marketing image(s)",
                 "details": [
-                    f"Channels: {', '.join(ch.upper() for ch in channels_with_images)}" if channels_with_images else "No images generated",
+                    f"Channels: {_join_upper(tuple(channels_with_images))}" if channels_with_images else "No images generated",
                 ],
                 "metrics": {"images_generated": count}
             }
@@ -207,21 +215,17 @@ def should_continue(state: ContentGeneratorState) -> str:
     if critic_feedback and not critic_feedback.passed:
         return "draft"
 
-    # Check for unsupported claims
-    drafts = state.get("drafts", {})
-    for draft in drafts.values():
-        for claim in draft.claims:
-            if not claim.is_supported:
-                return "draft"
-
-    return "export"
+    # Check for unsupported claims (counted by verify_node, so O(1))
+    return "draft" if state.get("unsupported_count", 0) else "export"
 
 
 def create_graph() -> StateGraph:
     """Create and compile the content generation pipeline.
 
     Pipeline flow:
-    INPUT -> RETRIEVER -> DRAFTER -> CRITIC -> VERIFIER -> [LOOP?] -> GENERATE_IMAGES -> EXPORTER
+    INPUT -> RETRIEVER -> DRAFTER -> (CRITIC | VERIFIER) -> [LOOP?] -> GENERATE_IMAGES -> EXPORTER
+
+    The critic and verifier run concurrently inside the review node.
 
     Returns:
         Compiled LangGraph workflow
@@ -231,8 +235,7 @@ def create_graph() -> StateGraph:
     # Add nodes
     workflow.add_node("retrieve", retrieve_node)
     workflow.add_node("draft", draft_node)
-    workflow.add_node("critic", critic_node)
-    workflow.add_node("verify", verify_node)
+    workflow.add_node("review", review_node)
     workflow.add_node("generate_images", generate_images_node)
     workflow.add_node("export", export_node)
 
@@ -241,12 +244,11 @@ def create_graph() -> StateGraph:
 
     # Add edges
     workflow.add_edge("retrieve", "draft")
-    workflow.add_edge("draft", "critic")
-    workflow.add_edge("critic", "verify")
+    workflow.add_edge("draft", "review")
 
     # Conditional edge for the quality loop
     workflow.add_conditional_edges(
-        "verify",
+        "review",
         should_continue,
         {
             "draft": "draft",  # Loop back for improvements
@@ -263,8 +265,10 @@ def create_graph() -> StateGraph:
     return workflow.compile()
 
 
-# Create a singleton graph instance
-graph = create_graph()
+@functools.lru_cache(maxsize=None)
+def get_pipeline():
+    """Return the compiled pipeline, building it once on first use."""
+    return create_graph()
 
 
 def run_pipeline(
@@ -276,6 +280,7 @@ def run_pipeline(
     event_date: str | None = None,
     relevant_urls: list[dict] | None = None,
     on_step: Optional[Callable[[str, str, int], None]] = None,
+    include_image_bytes: bool = False,
 ) -> dict:
     """Run the content generation pipeline with the given inputs.
 
@@ -288,11 +293,14 @@ def run_pipeline(
         event_date: Optional event date
         relevant_urls: Optional list of {"label": str, "url": str} dicts
         on_step: Optional callback called before each step with (step_name, description, iteration)
+        include_image_bytes: If True, also embed each image's bytes in
+            final_output["images"] (by default only file info is returned)
 
     Returns:
         Final output dictionary with generated content and audit log
     """
     initial_state: ContentGeneratorState = {
+        "run_id": _generate_run_id(),
         "event_title": event_title,
         "event_description": event_description,
         "event_date": event_date,
@@ -300,8 +308,11 @@ def run_pipeline(
         "key_messages": key_messages,
         "channels": channels,
         "relevant_urls": relevant_urls or [],
-        "brand_chunks": [],
-        "product_chunks": [],
+        "brand_chunks": {"ids": [], "texts": [], "sources": []},
+        "product_chunks": {"ids": [], "texts": [], "sources": []},
+        "brand_context": "",
+        "product_context": "",
+        "chunks_text": "",
         "drafts": {},
         "critic_feedback": None,
         "iteration": 0,
@@ -312,11 +323,23 @@ def run_pipeline(
 
     # If callback provided, run step-by-step for progress updates
     if on_step:
-        return _run_pipeline_with_callbacks(initial_state, on_step)
+        final_output = _run_pipeline_with_callbacks(initial_state, on_step)
+    else:
+        # Otherwise, run the graph normally
+        result = get_pipeline().invoke(initial_state)
+        final_output = result.get("final_output", {})
+
+    if include_image_bytes and final_output.get("images"):
+        final_output["images"] = {
+            channel: {**image, "bytes": Path(image["path"]).read_bytes()}
+            for channel, image in final_output["images"].items()
+        }
+    return final_output
+
 
-    # Otherwise, run the graph normally
-    result = graph.invoke(initial_state)
-    return result.get("final_output", {})
+def _generate_run_id() -> str:
+    """Generate a unique run ID for this pipeline execution."""
+    return f"run_{token_hex(6)}"
 
 
 def _run_pipeline_with_callbacks(
@@ -331,12 +354,49 @@ def _run_pipeline_with_callbacks(
         - step_name: Name of the step (retrieve, draft, critic, verify, export)
         - step_info: Dict with 'description', 'details' list, and optional 'metrics'
         - iteration: Current iteration number (0-indexed)
+
+    While the drafter, critic and verifier stream their responses, the
+    callback also receives partial updates (step_info["partial"] is True).
+    Because the critic and verifier stream concurrently, their partial
+    updates are combined under a single "review" step.
+    Nodes run on a worker thread and every callback is made from the calling
+    thread.
     """
     max_iterations = 3
 
+    # Streamed text deltas from any node thread, relayed to on_step below
+    progress: queue.SimpleQueue = queue.SimpleQueue()
+    state["progress_callback"] = lambda step, text: progress.put((step, len(text)))
+
+    def run_node(node: Callable[[ContentGeneratorState], dict]) -> None:
+        received: dict[str, int] = {}
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(node, state)
+            while not (future.done() and progress.empty()):
+                try:
+                    step, count = progress.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                # Coalesce whatever else has arrived into one update per step
+                received[step] = received.get(step, 0) + count
+                while not progress.empty():
+                    step, count = progress.get()
+                    received[step] = received.get(step, 0) + count
+                # One label per batch: concurrent streams share a combined step
+                step = next(iter(received)) if len(received) == 1 else "review"
+                on_step(step, {
+                    "description": PIPELINE_STEPS.get(step, "Processing..."),
+                    "details": [f"Received {sum(received.values()):,} characters"],
+                    "partial": True,
+                }, state.get("iteration", 0))
+            update = future.result()
+        # Emulate the compiled graph's audit_log reducer (operator.add)
+        state["audit_log"].extend(update.pop("audit_log", []))
+        state.update(update)
+
     # Step 1: Retrieve
     on_step("retrieve", get_step_details("retrieve", state, after=False), 0)
-    state = {**state, **retrieve_node(state)}
+    run_node(retrieve_node)
     on_step("retrieve_done", get_step_details("retrieve", state, after=True), 0)
 
     while True:
@@ -344,16 +404,13 @@ def _run_pipeline_with_callbacks(
 
         # Step 2: Draft
         on_step("draft", get_step_details("draft", state, after=False), iteration)
-        state = {**state, **draft_node(state)}
+        run_node(draft_node)
 
-        # Step 3: Critic
+        # Steps 3-4: Critic and Verify (run concurrently)
         on_step("critic", get_step_details("critic", state, after=False), iteration)
-        state = {**state, **critic_node(state)}
-        on_step("critic_done", get_step_details("critic", state, after=True), iteration)
-
-        # Step 4: Verify
         on_step("verify", get_step_details("verify", state, after=False), iteration)
-        state = {**state, **verify_node(state)}
+        run_node(review_node)
+        on_step("critic_done", get_step_details("critic", state, after=True), iteration)
         on_step("verify_done", get_step_details("verify", state, after=True), iteration)
 
         # Check if we should continue
@@ -364,12 +421,12 @@ def _run_pipeline_with_callbacks(
     # Step 5: Generate Images
     iteration = state.get("iteration", 0)
     on_step("generate_images", get_step_details("generate_images", state, after=False), iteration)
-    state = {**state, **generate_images_node(state)}
+    run_node(generate_images_node)
     on_step("generate_images_done", get_step_details("generate_images", state, after=True), iteration)
 
     # Step 6: Export
     on_step("export", get_step_details("export", state, after=False), iteration)
-    state = {**state, **export_node(state)}
+    run_node(export_node)
     on_step("export_done", get_step_details("export", state, after=True), iteration)
 
     return state.get("final_output", {})
@@ -0,0 +1,86 @@
+"""Content-addressed cache for LLM completions."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import Callable, Optional
+
+import diskcache
+
+_cache: diskcache.Cache | None = None
+
+
+def cache_disabled() -> bool:
+    """Whether the LLM cache is bypassed via the CACHE_DISABLED env var."""
+    return os.getenv("CACHE_DISABLED", "").lower() in ("1", "true", "yes")
+
+
+def get_llm_cache() -> diskcache.Cache:
+    """Get the on-disk LLM response cache, opening it on first use."""
+    global _cache
+    if _cache is None:
+        cache_dir = os.getenv("LLM_CACHE_DIRECTORY", "./.cache/llm")
+        _cache = diskcache.Cache(cache_dir)
+    return _cache
+
+
+def cached_completion(
+    client,
+    on_delta: Optional[Callable[[str], None]] = None,
+    **request,
+) -> str:
+    """Run a chat completion, reusing the stored response for identical requests.
+
+    The key is a SHA-256 of the full request (model, messages and any
+    other parameters), so any change to the prompt or settings misses.
+
+    Args:
+        client: OpenAI client used on a cache miss
+        on_delta: Optional callback; if given, a miss is streamed and each
+            text delta is passed to it as it arrives
+        **request: Keyword arguments for ``client.chat.completions.create``
+
+    Returns:
+        The completion's message content
+    """
+    if cache_disabled():
+        return _complete(client, on_delta, request)
+
+    key = _request_key(request)
+    cache = get_llm_cache()
+
+    content = cache.get(key)
+    if content is None:
+        content = _complete(client, on_delta, request)
+        cache.set(key, content)
+    return content
+
+
+def discard_cached_completion(**request) -> None:
+    """Drop the stored response for a request, e.g. one that failed to parse."""
+    if not cache_disabled():
+        get_llm_cache().delete(_request_key(request))
+
+
+def _request_key(request: dict) -> str:
+    """SHA-256 of a completion request, used as its cache key."""
+    return hashlib.sha256(
+        json.dumps(request, sort_keys=True).encode()
+    ).hexdigest()
+
+
+def _complete(client, on_delta: Optional[Callable[[str], None]], request: dict) -> str:
+    """Call the API, streaming the response when a delta callback is given."""
+    if on_delta is None:
+        response = client.chat.completions.create(**request)
+        return response.choices[0].message.content or ""
+
+    parts = []
+    for chunk in client.chat.completions.create(**request, stream=True):
+        text = chunk.choices[0].delta.content if chunk.choices else None
+        if text:
+            parts.append(text)
+            on_delta(text)
+    return "".join(parts)
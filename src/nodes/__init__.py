@@ -4,6 +4,7 @@ from .retriever import retrieve_node
 from .drafter import draft_node
 from .critic import critic_node
 from .verifier import verify_node
+from .reviewer import review_node
 from .image_generator import generate_images_node
 from .exporter import export_node
 
@@ -12,6 +13,7 @@ __all__ = [
     "draft_node",
     "critic_node",
     "verify_node",
+    "review_node",
     "generate_images_node",
     "export_node",
 ]
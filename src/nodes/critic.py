@@ -2,13 +2,23 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+import json
+import logging
+import time
+from functools import partial
 
-from openai import OpenAI
+from pydantic import ValidationError
 
+from ..clients import get_openai_client
+from ..llm_cache import cached_completion, discard_cached_completion
 from ..prompts import get_critic_prompt
 from ..schemas import ContentGeneratorState, CriticFeedback
 
+logger = logging.getLogger(__name__)
+
+# Extra attempts when the critic's response can't be parsed
+_MAX_RETRIES = 1
+
 
 def critic_node(state: ContentGeneratorState) -> ContentGeneratorState:
     """Evaluate all channel drafts against quality criteria.
@@ -26,23 +36,22 @@ def critic_node(state: ContentGeneratorState) -> ContentGeneratorState:
     Returns:
         Updated state with critic_feedback populated
     """
-    client = OpenAI()
+    client = get_openai_client()
 
     # Compile all drafts for evaluation
-    drafts_text = ""
+    parts = []
+    append = parts.append
     for channel, draft in state.get("drafts", {}).items():
-        drafts_text += f"\n\n=== {channel.upper()} ===\n"
+        append(f"\n\n=== {channel.upper()} ===\n")
         if draft.headline:
-            drafts_text += f"Headline: {draft.headline}\n"
+            append(f"Headline: {draft.headline}\n")
         if draft.subject_line:
-            drafts_text += f"Subject: {draft.subject_line}\n"
-        drafts_text += f"Body: {draft.body}\n"
-        drafts_text += f"CTA: {draft.cta}\n"
+            append(f"Subject: {draft.subject_line}\n")
+        append(f"Body: {draft.body}\nCTA: {draft.cta}\n")
+    drafts_text = "".join(parts)
 
-    # Build brand context for comparison
-    brand_context = "\n\n".join(
-        f"[{chunk['id']}]: {chunk['text']}" for chunk in state.get("brand_chunks", [])
-    )
+    # Brand context for comparison, formatted once by retrieve_node
+    brand_context = state.get("brand_context", "")
 
     prompt = get_critic_prompt(
         drafts=drafts_text,
@@ -50,19 +59,36 @@ def critic_node(state: ContentGeneratorState) -> ContentGeneratorState:
         channels=state["channels"],
     )
 
-    response = client.chat.completions.create(
-        model="gpt-4o",
-        max_tokens=1500,
-        messages=[{"role": "user", "content": prompt}],
-    )
+    # Stream the response when a caller is watching progress
+    progress_callback = state.get("progress_callback")
+    on_delta = partial(progress_callback, "critic") if progress_callback else None
+
+    request = {
+        "model": "gpt-4o",
+        "max_tokens": 1500,
+        "messages": [{"role": "user", "content": prompt}],
+        "response_format": {"type": "json_object"},
+    }
 
-    # Parse the response into CriticFeedback
-    feedback = _parse_critic_response(response.choices[0].message.content)
+    # Parse the response into CriticFeedback, retrying a malformed one
+    for _ in range(_MAX_RETRIES + 1):
+        response_text = cached_completion(client, on_delta=on_delta, **request)
+        feedback = _parse_critic_response(response_text)
+        if feedback is not None:
+            break
+        # Don't serve the bad response again from the cache
+        discard_cached_completion(**request)
+    else:
+        logger.warning(
+            "No usable critic response after %d attempts; failing the drafts",
+            _MAX_RETRIES + 1,
+        )
+        feedback = _failed_evaluation()
 
     # Log the critique action
     audit_entry = {
         "node": "critic",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp_ns": time.time_ns(),
         "action": "evaluated_drafts",
         "details": {
             "brand_voice_score": feedback.brand_voice_score,
@@ -73,31 +99,49 @@ def critic_node(state: ContentGeneratorState) -> ContentGeneratorState:
     }
 
     return {
-        **state,
         "critic_feedback": feedback,
-        "audit_log": state.get("audit_log", []) + [audit_entry],
+        "audit_log": [audit_entry],
     }
 
 
-def _parse_critic_response(response_text: str) -> CriticFeedback:
-    """Parse the LLM response into structured CriticFeedback.
+def _parse_critic_response(response_text: str) -> CriticFeedback | None:
+    """Parse the LLM's JSON response into structured CriticFeedback.
 
-    TODO: Implement proper structured output parsing.
-    For now, returns a placeholder that passes.
+    ``passed`` is re-derived from the scores so the loop condition never
+    disagrees with them, and may be left out of the response.
 
     Args:
         response_text: Raw LLM response
 
     Returns:
-        Parsed CriticFeedback object
+        Parsed CriticFeedback object, or None if the response can't be
+        decoded or validated (e.g. a missing or out-of-range score)
+    """
+    try:
+        feedback = CriticFeedback.model_validate(json.loads(response_text or ""))
+    except (json.JSONDecodeError, ValidationError) as e:
+        logger.warning("Invalid critic response: %s", e)
+        return None
+
+    feedback.passed = (
+        feedback.brand_voice_score >= 7
+        and feedback.cta_clarity_score >= 7
+        and feedback.length_ok
+    )
+    return feedback
+
+
+def _failed_evaluation() -> CriticFeedback:
+    """A failing evaluation for when the critic never returned usable feedback.
+
+    Failing sends every channel back for a re-draft (until the iteration
+    limit) rather than letting unreviewed drafts through.
     """
-    # Placeholder implementation - will be enhanced with structured output
-    # Default to passing for now
     return CriticFeedback(
-        brand_voice_score=8,
-        cta_clarity_score=8,
-        length_ok=True,
-        issues=[],
+        brand_voice_score=0,
+        cta_clarity_score=0,
+        length_ok=False,
+        issues=["The critic's response could not be parsed"],
         fixes=[],
-        passed=True,
+        passed=False,
     )
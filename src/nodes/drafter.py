@@ -2,13 +2,32 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
-from openai import OpenAI
+from pydantic import ValidationError
 
-from ..prompts import get_drafter_prompt
+from ..clients import get_openai_client
+from ..llm_cache import cached_completion
+from ..prompts import (
+    get_batched_drafter_prompt,
+    get_drafter_prompt,
+    get_drafter_system_prompt,
+)
 from ..schemas import ChannelDraft, Claim, ContentGeneratorState
 
+# [source: chunk_id] citations, and the text before/after them in the same sentence
+_SOURCE_RE = re.compile(r"\[source:\s*(\w+)\]")
+_INLINE_RE = re.compile(r"([^.!?\n]*)\[source:\s*(\w+)\]([^.!?\n]*[.!?]?)")
+
+# gpt-4o limits, used to decide whether a batched draft call fits
+_MAX_TOKENS_PER_CHANNEL = 2000
+_MAX_OUTPUT_TOKENS = 16384
+_CONTEXT_WINDOW_TOKENS = 128000
+
 
 def draft_node(state: ContentGeneratorState) -> ContentGeneratorState:
     """Generate content drafts for all selected channels.
@@ -16,7 +35,11 @@ def draft_node(state: ContentGeneratorState) -> ContentGeneratorState:
     Uses OpenAI to generate channel-appropriate content, grounded in
     the retrieved brand voice and product documentation chunks.
 
-    If this is a re-draft (iteration > 0), incorporates critic feedback.
+    If this is a re-draft (iteration > 0), incorporates critic feedback and
+    only revises the channels flagged by the critic or the verifier.
+    Several channels are drafted in one batched LLM call; a single channel,
+    a batch too large for the model, or channels missing from the batched
+    response are drafted concurrently with one call per channel.
 
     Args:
         state: Current pipeline state with retrieved chunks
@@ -24,16 +47,12 @@ def draft_node(state: ContentGeneratorState) -> ContentGeneratorState:
     Returns:
         Updated state with drafts populated for each channel
     """
-    client = OpenAI()
+    client = get_openai_client()
     iteration = state.get("iteration", 0) + 1
 
-    # Build context from retrieved chunks
-    brand_context = "\n\n".join(
-        f"[{chunk['id']}]: {chunk['text']}" for chunk in state.get("brand_chunks", [])
-    )
-    product_context = "\n\n".join(
-        f"[{chunk['id']}]: {chunk['text']}" for chunk in state.get("product_chunks", [])
-    )
+    # Context from retrieved chunks, formatted once by retrieve_node
+    brand_context = state.get("brand_context", "")
+    product_context = state.get("product_context", "")
 
     # Get critic feedback if this is a re-draft
     critic_feedback = state.get("critic_feedback")
@@ -47,9 +66,14 @@ Previous feedback to address:
 - Suggested Fixes: {', '.join(critic_feedback.fixes)}
 """
 
-    drafts: dict[str, ChannelDraft] = {}
+    # Stream responses when a caller is watching progress
+    progress_callback = state.get("progress_callback")
+    on_delta = partial(progress_callback, "draft") if progress_callback else None
+
+    # Identical across channels so OpenAI's prefix cache can reuse the prefill
+    system_prompt = get_drafter_system_prompt(brand_context, product_context, feedback_text)
 
-    for channel in state["channels"]:
+    def _draft_one(channel: str) -> ChannelDraft:
         prompt = get_drafter_prompt(
             channel=channel,
             event_title=state["event_title"],
@@ -57,46 +81,127 @@ Previous feedback to address:
             event_date=state.get("event_date"),
             target_audience=state["target_audience"],
             key_messages=state["key_messages"],
-            brand_context=brand_context,
-            product_context=product_context,
-            feedback=feedback_text,
             relevant_urls=state.get("relevant_urls", []),
         )
 
-        response = client.chat.completions.create(
+        # Identical requests (e.g. re-running the same event) hit the cache
+        response_text = cached_completion(
+            client,
             model="gpt-4o",
-            max_tokens=2000,
-            messages=[{"role": "user", "content": prompt}],
+            max_tokens=_MAX_TOKENS_PER_CHANNEL,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt},
+            ],
+            response_format={"type": "json_object"},
+            on_delta=on_delta,
         )
 
         # Parse the response into a ChannelDraft
-        draft = _parse_draft_response(channel, response.choices[0].message.content)
-        drafts[channel] = draft
+        return _parse_draft_response(channel, response_text)
+
+    def _draft_batch(channels: list[str]) -> dict[str, ChannelDraft]:
+        prompt = get_batched_drafter_prompt(
+            channels=channels,
+            event_title=state["event_title"],
+            event_description=state["event_description"],
+            event_date=state.get("event_date"),
+            target_audience=state["target_audience"],
+            key_messages=state["key_messages"],
+            relevant_urls=state.get("relevant_urls", []),
+        )
+        max_tokens = _MAX_TOKENS_PER_CHANNEL * len(channels)
+        # Rough 4-chars-per-token estimate; too big for one call means no batch
+        if max_tokens > _MAX_OUTPUT_TOKENS or (len(system_prompt) + len(prompt)) // 4 + max_tokens > _CONTEXT_WINDOW_TOKENS:
+            return {}
+
+        response_text = cached_completion(
+            client,
+            model="gpt-4o",
+            max_tokens=max_tokens,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt},
+            ],
+            response_format={"type": "json_object"},
+            on_delta=on_delta,
+        )
+        return _parse_batched_draft_response(channels, response_text)
+
+    # On re-draft, only revise the channels that need it and keep the rest
+    channels = _channels_to_draft(state) if iteration > 1 else state["channels"]
+    drafts: dict[str, ChannelDraft] = dict(state.get("drafts", {})) if iteration > 1 else {}
+
+    # Draft several channels in one call to save round trips
+    batched = _draft_batch(channels) if len(channels) > 1 else {}
+    drafts.update(batched)
+
+    # Anything not covered by the batch is drafted concurrently, one call each
+    remaining = [channel for channel in channels if channel not in batched]
+    if remaining:
+        with ThreadPoolExecutor(max_workers=len(remaining)) as executor:
+            drafts.update(zip(remaining, executor.map(_draft_one, remaining)))
 
     # Log the drafting action
     audit_entry = {
         "node": "draft",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp_ns": time.time_ns(),
         "action": "generated_drafts",
         "details": {
             "iteration": iteration,
-            "channels": list(drafts.keys()),
+            "channels": list(channels),
+            "batched": list(batched),
             "had_feedback": bool(feedback_text),
         },
     }
 
     return {
-        **state,
         "drafts": drafts,
         "iteration": iteration,
-        "audit_log": state.get("audit_log", []) + [audit_entry],
+        "audit_log": [audit_entry],
     }
 
 
+def _channels_to_draft(state: ContentGeneratorState) -> list[str]:
+    """Pick the channels to revise on a re-draft.
+
+    A channel is revised if the critic listed it in ``affected_channels``,
+    if any of its claims is unsupported, or if it has no draft yet. If the
+    critic failed the drafts without naming any of the run's channels, all
+    are revised.
+    """
+    channels = state["channels"]
+    drafts = state.get("drafts", {})
+
+    affected: set[str] = set()
+    critic_feedback = state.get("critic_feedback")
+    if critic_feedback and not critic_feedback.passed:
+        # The names come from the LLM: normalize "LinkedIn " and drop unknowns
+        named = {
+            str(name).strip().lower() for name in critic_feedback.affected_channels
+        }
+        named.intersection_update(channels)
+        if not named:
+            return channels
+        affected.update(named)
+
+    affected.update(
+        channel
+        for channel, draft in drafts.items()
+        if any(not claim.is_supported for claim in draft.claims)
+    )
+
+    return [
+        channel for channel in channels if channel in affected or channel not in drafts
+    ] or channels
+
+
 def _parse_draft_response(channel: str, response_text: str) -> ChannelDraft:
-    """Parse the LLM response into a structured ChannelDraft.
+    """Parse the LLM's JSON response into a structured ChannelDraft.
 
-    Extracts HEADLINE, SUBJECT, BODY, CTA, and CLAIMS from the LLM response.
+    Expects the JSON object requested by the drafter prompt (headline,
+    subject_line, body, cta, claims). If the response can't be decoded,
+    the whole response is used as the body.
 
     Args:
         channel: The channel this draft is for
@@ -105,73 +210,82 @@ def _parse_draft_response(channel: str, response_text: str) -> ChannelDraft:
     Returns:
         Parsed ChannelDraft object
     """
-    import re
+    data = _load_json_object(response_text)
+
+    # Fallback: use the whole response if no body was returned
+    return _build_draft(channel, data, fallback_body=response_text or "")
+
+
+def _parse_batched_draft_response(channels: list[str], response_text: str) -> dict[str, ChannelDraft]:
+    """Parse a batched JSON response into one ChannelDraft per channel.
+
+    Channels whose entry is missing, has no body or doesn't validate are
+    left out, so the caller can draft them individually.
+
+    Args:
+        channels: The channels requested in the batched prompt
+        response_text: Raw LLM response, a JSON object keyed by channel
+
+    Returns:
+        Dict of channel -> parsed ChannelDraft
+    """
+    data = _load_json_object(response_text)
+    drafts = {}
+    for channel in channels:
+        payload = data.get(channel)
+        if isinstance(payload, dict) and _as_text(payload.get("body")):
+            try:
+                drafts[channel] = _build_draft(channel, payload)
+            except ValidationError:
+                continue
+    return drafts
+
+
+def _load_json_object(response_text: str) -> dict:
+    """Decode a JSON object response, or return an empty dict."""
+    try:
+        data = json.loads(response_text or "")
+    except json.JSONDecodeError:
+        return {}
+    return data if isinstance(data, dict) else {}
 
-    headline = None
-    subject_line = None
-    body = ""
-    cta = "Learn more"
+
+def _build_draft(channel: str, data: dict, fallback_body: str = "") -> ChannelDraft:
+    """Build a ChannelDraft from one channel's decoded JSON payload.
+
+    Values come straight from the LLM, so scalars are coerced to text and
+    malformed entries are skipped.
+    """
+    body = _as_text(data.get("body")) or fallback_body
     claims = []
 
-    # Extract HEADLINE
-    headline_match = re.search(r"HEADLINE:\s*(.+?)(?=\n(?:SUBJECT|BODY|CTA|CLAIMS)|$)", response_text, re.IGNORECASE | re.DOTALL)
-    if headline_match:
-        headline = headline_match.group(1).strip()
-        # Clean up if it contains other sections
-        if "\n" in headline:
-            headline = headline.split("\n")[0].strip()
-
-    # Extract SUBJECT (for email)
-    subject_match = re.search(r"SUBJECT:\s*(.+?)(?=\n(?:BODY|CTA|CLAIMS)|$)", response_text, re.IGNORECASE | re.DOTALL)
-    if subject_match:
-        subject_line = subject_match.group(1).strip()
-        if "\n" in subject_line:
-            subject_line = subject_line.split("\n")[0].strip()
-
-    # Extract BODY
-    body_match = re.search(r"BODY:\s*(.+?)(?=\nCTA:|CLAIMS:|$)", response_text, re.IGNORECASE | re.DOTALL)
-    if body_match:
-        body = body_match.group(1).strip()
-    else:
-        # Fallback: use the whole response if no BODY marker found
-        body = response_text
-
-    # Extract CTA
-    cta_match = re.search(r"CTA:\s*(.+?)(?=\nCLAIMS:|$)", response_text, re.IGNORECASE | re.DOTALL)
-    if cta_match:
-        cta = cta_match.group(1).strip()
-        if "\n" in cta:
-            cta = cta.split("\n")[0].strip()
-
-    # Extract CLAIMS from dedicated section
-    claims_match = re.search(r"CLAIMS:\s*(.+?)$", response_text, re.IGNORECASE | re.DOTALL)
-    if claims_match:
-        claims_text = claims_match.group(1).strip()
-        # Parse individual claims
-        claim_lines = [line.strip().lstrip("- ") for line in claims_text.split("\n") if line.strip()]
-        for claim_line in claim_lines:
-            # Extract source from claim line
-            source_match = re.search(r"\[source:\s*(\w+)\]", claim_line)
-            source_id = source_match.group(1) if source_match else None
-            claim_text = re.sub(r"\[source:\s*\w+\]", "", claim_line).strip()
-            if claim_text:
-                claims.append(Claim(
-                    text=claim_text,
-                    source_chunk_id=source_id,
-                    is_supported=source_id is not None,
-                ))
+    # Claims from the dedicated list
+    raw_claims = data.get("claims")
+    for item in raw_claims if isinstance(raw_claims, list) else []:
+        if not isinstance(item, dict):
+            continue
+        claim_text = _SOURCE_RE.sub("", _as_text(item.get("text")) or "").strip()
+        source_id = _as_text(item.get("source_chunk_id"))
+        if claim_text:
+            claims.append(Claim(
+                text=claim_text,
+                source_chunk_id=source_id,
+                is_supported=source_id is not None,
+            ))
 
     # Also extract inline citations from body text
     # Find sentences/phrases with [source: chunk_xxx] citations
-    inline_citations = re.findall(r"([^.!?\n]*\[source:\s*(\w+)\][^.!?\n]*[.!?]?)", body)
-    for citation_match in inline_citations:
-        full_text, source_id = citation_match
-        # Clean up the claim text
-        claim_text = re.sub(r"\[source:\s*\w+\]", "", full_text).strip()
-        claim_text = claim_text.strip(".,!? ")
+    seen = {c.text.lower() for c in claims}
+    for match in _INLINE_RE.finditer(body):
+        before, source_id, after = match.groups()
+        # Only the part before the (last) citation can hold further citations
+        if "[source:" in before:
+            before = _SOURCE_RE.sub("", before)
+        claim_text = (before + after).strip().strip(".,!? ")
         # Avoid duplicates
-        existing_texts = [c.text.lower() for c in claims]
-        if claim_text and claim_text.lower() not in existing_texts:
+        key = claim_text.lower()
+        if claim_text and key not in seen:
+            seen.add(key)
             claims.append(Claim(
                 text=claim_text,
                 source_chunk_id=source_id,
@@ -180,9 +294,16 @@ def _parse_draft_response(channel: str, response_text: str) -> ChannelDraft:
 
     return ChannelDraft(
         channel=channel,
-        headline=headline,
+        headline=_as_text(data.get("headline")),
         body=body,
-        cta=cta,
-        subject_line=subject_line,
+        cta=_as_text(data.get("cta")) or "Learn more",
+        subject_line=_as_text(data.get("subject_line")),
         claims=claims,
     )
+
+
+def _as_text(value) -> str | None:
+    """Coerce a scalar JSON value to text; None, empty or nested values give None."""
+    if value is None or isinstance(value, (dict, list)):
+        return None
+    return str(value) or None
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+import time
+from datetime import datetime, timezone
 
 from ..schemas import ContentGeneratorState
 
@@ -61,13 +62,13 @@ def export_node(state: ContentGeneratorState) -> ContentGeneratorState:
     # Compile final output
     final_output = {
         "content": content,
-        "images": state.get("images", {}),
+        "images": state.get("images", {}),  # {path, size, mime} per channel; bytes stay on disk
         "relevant_urls": state.get("relevant_urls", []),
         "scorecard": scorecard,
         "claims_table": claims_table,
         "audit_log": {
-            "run_id": _generate_run_id(),
-            "timestamp": datetime.utcnow().isoformat(),
+            "run_id": state.get("run_id"),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
             "input": {
                 "event_title": state.get("event_title"),
                 "event_description": state.get("event_description"),
@@ -77,17 +78,17 @@ def export_node(state: ContentGeneratorState) -> ContentGeneratorState:
                 "channels": state.get("channels"),
             },
             "sources_retrieved": {
-                "brand_chunks": len(state.get("brand_chunks", [])),
-                "product_chunks": len(state.get("product_chunks", [])),
+                "brand_chunks": len(state.get("brand_chunks", {}).get("ids", [])),
+                "product_chunks": len(state.get("product_chunks", {}).get("ids", [])),
             },
-            "iterations": state.get("audit_log", []),
+            "iterations": [_format_entry(entry) for entry in state.get("audit_log", [])],
         },
     }
 
     # Log the export action
     audit_entry = {
         "node": "export",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp_ns": time.time_ns(),
         "action": "exported_final_output",
         "details": {
             "channels_exported": list(content.keys()),
@@ -96,14 +97,23 @@ def export_node(state: ContentGeneratorState) -> ContentGeneratorState:
     }
 
     return {
-        **state,
         "final_output": final_output,
-        "audit_log": state.get("audit_log", []) + [audit_entry],
+        "audit_log": [audit_entry],
     }
 
 
-def _generate_run_id() -> str:
-    """Generate a unique run ID for this pipeline execution."""
-    import uuid
+def _format_entry(entry: dict) -> dict:
+    """Copy an audit entry with its time_ns stamp rendered as an ISO timestamp."""
+    return {
+        ("timestamp" if key == "timestamp_ns" else key): (
+            _isoformat(value) if key == "timestamp_ns" else value
+        )
+        for key, value in entry.items()
+    }
+
 
-    return f"run_{uuid.uuid4().hex[:12]}"
+def _isoformat(timestamp_ns: int) -> str:
+    """Format a time.time_ns() value as a UTC ISO 8601 timestamp."""
+    return datetime.fromtimestamp(timestamp_ns / 1e9, tz=timezone.utc).isoformat(
+        timespec="seconds"
+    )
@@ -2,13 +2,15 @@
 
 from __future__ import annotations
 
+import mimetypes
 import os
-from datetime import datetime
-
-from google import genai
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
+from ..clients import get_genai_client
 from ..prompts import get_image_prompt
-from ..schemas import ContentGeneratorState
+from ..schemas import ChannelDraft, ContentGeneratorState
 
 
 def generate_images_node(state: ContentGeneratorState) -> ContentGeneratorState:
@@ -16,12 +18,17 @@ def generate_images_node(state: ContentGeneratorState) -> ContentGeneratorState:
 
     Creates visually appealing header/banner images tailored to each
     marketing channel based on the event details and generated content.
+    Channels are generated concurrently; a failing channel is recorded in
+    the audit log without affecting the others. Images are written to
+    ``{RUNS_DIRECTORY}/{run_id}/{channel}.<ext>`` (extension taken from the
+    returned mime type) and only their file info
+    is kept in state.
 
     Args:
         state: Current pipeline state with finalized drafts
 
     Returns:
-        Updated state with generated images
+        Updated state with generated image file info per channel
     """
     api_key = os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY")
 
@@ -29,22 +36,19 @@ def generate_images_node(state: ContentGeneratorState) -> ContentGeneratorState:
         # Skip image generation if no API key
         audit_entry = {
             "node": "generate_images",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp_ns": time.time_ns(),
             "action": "skipped",
             "details": {"reason": "No GEMINI_API_KEY found in environment"},
         }
         return {
-            **state,
             "images": {},
-            "audit_log": state.get("audit_log", []) + [audit_entry],
+            "audit_log": [audit_entry],
         }
 
-    client = genai.Client(api_key=api_key)
-    images = {}
-    generated_count = 0
-    errors = []
+    client = get_genai_client(api_key)
+    run_dir = Path(os.environ.get("RUNS_DIRECTORY", "./runs")) / state.get("run_id", "run_local")
 
-    for channel, draft in state.get("drafts", {}).items():
+    def _generate_one(channel: str, draft: ChannelDraft) -> tuple[str, dict | None, str | None]:
         try:
             # Build channel-specific prompt
             prompt = get_image_prompt(
@@ -63,18 +67,39 @@ def generate_images_node(state: ContentGeneratorState) -> ContentGeneratorState:
             # Extract image from response parts
             for part in response.parts:
                 if part.inline_data is not None:
-                    # Store raw image bytes for easy display
-                    images[channel] = part.inline_data.data
-                    generated_count += 1
-                    break
+                    # Write to disk so the bytes don't ride along in state
+                    data = part.inline_data.data
+                    mime = part.inline_data.mime_type or "image/png"
+                    extension = mimetypes.guess_extension(mime) or ".png"
+                    run_dir.mkdir(parents=True, exist_ok=True)
+                    path = run_dir / f"{channel}{extension}"
+                    path.write_bytes(data)
+                    return channel, {"path": str(path), "size": len(data), "mime": mime}, None
+            return channel, None, None
 
         except Exception as e:
-            errors.append({"channel": channel, "error": str(e)})
+            return channel, None, str(e)
+
+    images = {}
+    generated_count = 0
+    errors = []
+
+    # Each channel's image is independent, so generate them concurrently
+    drafts = state.get("drafts", {})
+    with ThreadPoolExecutor(max_workers=max(len(drafts), 1)) as executor:
+        results = list(executor.map(_generate_one, drafts.keys(), drafts.values()))
+
+    for channel, image, error in results:
+        if image is not None:
+            images[channel] = image
+            generated_count += 1
+        elif error is not None:
+            errors.append({"channel": channel, "error": error})
 
     # Log the generation action
     audit_entry = {
         "node": "generate_images",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp_ns": time.time_ns(),
         "action": "generated_images",
         "details": {
             "channels_requested": list(state.get("drafts", {}).keys()),
@@ -84,7 +109,6 @@ def generate_images_node(state: ContentGeneratorState) -> ContentGeneratorState:
     }
 
     return {
-        **state,
         "images": images,
-        "audit_log": state.get("audit_log", []) + [audit_entry],
+        "audit_log": [audit_entry],
     }
@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+import logging
+import time
 
+from ..prompts import format_chunks_for_prompt
 from ..schemas import ContentGeneratorState
 
+logger = logging.getLogger(__name__)
+
 
 def retrieve_node(state: ContentGeneratorState) -> ContentGeneratorState:
     """Retrieve relevant chunks from the vector store for RAG grounding.
@@ -14,13 +18,16 @@ def retrieve_node(state: ContentGeneratorState) -> ContentGeneratorState:
     1. Brand voice examples that match the target audience and tone
     2. Product documentation relevant to the event topic
 
+    Both kinds come from a single query over the corpus collection.
+
     Args:
         state: Current pipeline state with event details
 
     Returns:
-        Updated state with brand_chunks and product_chunks populated
+        Updated state with brand_chunks and product_chunks populated, plus
+        their prompt-formatted text (brand_context, product_context, chunks_text)
     """
-    from ..rag import retrieve_chunks
+    from ..rag import embed_query, retrieve_all_chunks
 
     # Build query from event details
     query_text = f"""
@@ -30,35 +37,44 @@ def retrieve_node(state: ContentGeneratorState) -> ContentGeneratorState:
     Key Messages: {', '.join(state['key_messages'])}
     """
 
-    # Retrieve brand voice examples
-    brand_chunks = retrieve_chunks(
-        query=query_text,
-        collection_name="brand_voice",
-        top_k=5,
-    )
+    # Embed the query once and search both collections with it
+    try:
+        query_embedding = embed_query(query_text)
+    except Exception as e:
+        logger.warning("Query embedding failed: %s", e)
+        query_embedding = None
 
-    # Retrieve product/company information
-    product_chunks = retrieve_chunks(
-        query=query_text,
-        collection_name="product_docs",
-        top_k=5,
+    # Retrieve brand voice examples and product/company information
+    # with one query over the corpus collection
+    chunks = retrieve_all_chunks(
+        query_text, ("brand_voice", "product_docs"), 5, query_embedding
     )
+    brand_chunks = chunks["brand_voice"]
+    product_chunks = chunks["product_docs"]
+
+    # Format the prompt context once; the drafter, critic and verifier reuse it
+    # on every iteration
+    brand_context = format_chunks_for_prompt(brand_chunks)
+    product_context = format_chunks_for_prompt(product_chunks)
+    chunks_text = format_chunks_for_prompt(brand_chunks, product_chunks)
 
     # Log the retrieval action
     audit_entry = {
         "node": "retrieve",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp_ns": time.time_ns(),
         "action": "retrieved_chunks",
         "details": {
-            "brand_chunks_count": len(brand_chunks),
-            "product_chunks_count": len(product_chunks),
+            "brand_chunks_count": len(brand_chunks["ids"]),
+            "product_chunks_count": len(product_chunks["ids"]),
             "query_preview": query_text[:200],
         },
     }
 
     return {
-        **state,
         "brand_chunks": brand_chunks,
         "product_chunks": product_chunks,
-        "audit_log": state.get("audit_log", []) + [audit_entry],
+        "brand_context": brand_context,
+        "product_context": product_context,
+        "chunks_text": chunks_text,
+        "audit_log": [audit_entry],
     }
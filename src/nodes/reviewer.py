@@ -0,0 +1,36 @@
+"""Reviewer node - runs the critic and verifier side by side."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+from ..schemas import ContentGeneratorState
+from .critic import critic_node
+from .verifier import verify_node
+
+
+def review_node(state: ContentGeneratorState) -> ContentGeneratorState:
+    """Evaluate and fact-check the current drafts concurrently.
+
+    The critic scores the drafts and the verifier checks their claims;
+    neither reads the other's output, so their LLM calls run in parallel
+    instead of back to back.
+
+    Args:
+        state: Current pipeline state with drafts
+
+    Returns:
+        Updated state with critic_feedback and verified drafts
+    """
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        critic_future = executor.submit(critic_node, state)
+        verify_future = executor.submit(verify_node, state)
+        critic_update = critic_future.result()
+        verify_update = verify_future.result()
+
+    return {
+        "critic_feedback": critic_update["critic_feedback"],
+        "drafts": verify_update["drafts"],
+        "unsupported_count": verify_update["unsupported_count"],
+        "audit_log": critic_update["audit_log"] + verify_update["audit_log"],
+    }
@@ -2,13 +2,50 @@
 
 from __future__ import annotations
 
-from datetime import datetime
-
-from openai import OpenAI
-
-from ..prompts import get_verifier_prompt
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Callable, Iterator, Optional
+
+from ..clients import get_openai_client
+from ..prompts import get_verifier_prompt_prefix, get_verifier_prompt_suffix
 from ..schemas import Claim, ContentGeneratorState
 
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+# Cap on concurrent verifier calls, to stay clear of API rate limits
+_MAX_WORKERS = 8
+
+# Above this many prompt tokens (~4 chars each), verify channels one call each
+_MAX_BATCH_PROMPT_TOKENS = 100_000
+_MAX_TOKENS_PER_CHANNEL = 1500
+_MAX_OUTPUT_TOKENS = 16384
+
+# Before a field name: an optional list marker ("-", "1.") and markdown
+# emphasis or heading marks, as in "- **CLAIM:** ..."
+_FIELD_PREFIX = r"[^\S\n]*(?:(?:[-*+•]|\d+[.)])[^\S\n]+)?[*_#]*[^\S\n]*"
+# The colon after a field name, with emphasis on either side
+_FIELD_SEP = r"[*_]*:[*_]*[^\S\n]*"
+
+# One verifier claim block: an optional CHANNEL line, a CLAIM line, then
+# optional SOURCE and SUPPORTED lines. A value may also start on the line
+# after its field name.
+_CLAIM_RE = re.compile(
+    rf"^(?:{_FIELD_PREFIX}CHANNEL{_FIELD_SEP}"
+    r"[`*_]*(?P<channel>[\w-]+)[^\n]*\n\s*)?"
+    rf"{_FIELD_PREFIX}CLAIM{_FIELD_SEP}"
+    rf"(?:\n(?!{_FIELD_PREFIX}(?:CHANNEL|CLAIM|SOURCE|SUPPORTED)\b)[^\S\n]*)?"
+    r"(?P<claim>[^\n]*)"
+    rf"(?:\n\s*{_FIELD_PREFIX}SOURCE{_FIELD_SEP}"
+    r"(?:\n[^\S\n]*)?[`*_]*(?P<source>[^\s`*]+)[^\n]*)?"
+    rf"(?:\n\s*{_FIELD_PREFIX}SUPPORTED{_FIELD_SEP}"
+    r"(?:\n[^\S\n]*)?[`*_]*(?P<supported>true|false))?",
+    re.IGNORECASE | re.MULTILINE,
+)
+
 
 def verify_node(state: ContentGeneratorState) -> ContentGeneratorState:
     """Verify that all factual claims in drafts have source citations.
@@ -19,34 +56,66 @@ def verify_node(state: ContentGeneratorState) -> ContentGeneratorState:
     3. If from event form input: mark as supported with source "user_input"
     4. If neither: mark as unsupported (will trigger re-draft)
 
+    Several channels are verified in one batched LLM call; a single channel,
+    or a batch too large for one prompt, is verified one call per channel,
+    concurrently. Responses are streamed and their claim blocks parsed as
+    they complete; with VERIFIER_EARLY_EXIT set, a channel's response is cut
+    off at its first unsupported claim, since that alone forces a re-draft.
+    Channels a cut-off batched response never reached are verified one call
+    per channel, so none of them passes unchecked.
+
     Args:
         state: Current pipeline state with drafts and claims
 
     Returns:
-        Updated state with verified claims
+        Updated state with verified claims and the unsupported claim count
     """
-    client = OpenAI()
+    client = get_openai_client()
+    progress_callback = state.get("progress_callback")
+    on_delta = partial(progress_callback, "verify") if progress_callback else None
+    early_exit = _early_exit_enabled()
 
-    # Combine all source chunks for verification
-    all_chunks = state.get("brand_chunks", []) + state.get("product_chunks", [])
-    chunks_text = "\n\n".join(
-        f"[{chunk['id']}]: {chunk['text']}" for chunk in all_chunks
-    )
+    # All source chunks for verification, formatted once by retrieve_node
+    chunks_text = state.get("chunks_text", "")
 
     # Build event context for user_input verification
     event_context = _build_event_context(state)
 
+    # Sources and event context are shared by every call; build them once
+    prompt_prefix = get_verifier_prompt_prefix(chunks_text, event_context)
+
     # Track verification results
     verified_drafts = {}
     unsupported_claims = []
 
-    for channel, draft in state.get("drafts", {}).items():
-        # Extract claims from the draft content
-        claims = _extract_claims(draft.body, chunks_text, event_context, client)
-
-        # Update draft with verified claims
-        verified_draft = draft.model_copy(update={"claims": claims})
-        verified_drafts[channel] = verified_draft
+    # Verify several channels in one call to share the sources prefix
+    drafts = state.get("drafts", {})
+    channel_claims = None
+    if len(drafts) > 1:
+        channel_claims = _extract_channel_claims(
+            drafts, prompt_prefix, client, on_delta, early_exit
+        )
+
+    # Channels the batch didn't cover are independent LLM calls, verified concurrently
+    channel_claims = channel_claims or {}
+    pending = {
+        channel: draft for channel, draft in drafts.items() if channel not in channel_claims
+    }
+    if pending:
+        with ThreadPoolExecutor(max_workers=min(len(pending), _MAX_WORKERS)) as executor:
+            channel_claims.update(zip(pending, executor.map(
+                lambda draft: _extract_claims(
+                    draft.body, prompt_prefix, client, on_delta, early_exit
+                ),
+                pending.values(),
+            )))
+
+    for channel, draft in drafts.items():
+        claims = channel_claims[channel]
+
+        # Attach verified claims in place; the draft was validated when built
+        draft.claims = claims
+        verified_drafts[channel] = draft
 
         # Track unsupported claims
         for claim in claims:
@@ -58,7 +127,7 @@ def verify_node(state: ContentGeneratorState) -> ContentGeneratorState:
     # Log the verification action
     audit_entry = {
         "node": "verify",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp_ns": time.time_ns(),
         "action": "verified_claims",
         "details": {
             "total_claims": sum(
@@ -70,9 +139,9 @@ def verify_node(state: ContentGeneratorState) -> ContentGeneratorState:
     }
 
     return {
-        **state,
         "drafts": verified_drafts,
-        "audit_log": state.get("audit_log", []) + [audit_entry],
+        "unsupported_count": len(unsupported_claims),
+        "audit_log": [audit_entry],
     }
 
 
@@ -99,62 +168,185 @@ def _build_event_context(state: ContentGeneratorState) -> str:
     return "\n\n".join(parts)
 
 
+def _early_exit_enabled() -> bool:
+    """Whether verification stops at the first unsupported claim (VERIFIER_EARLY_EXIT)."""
+    return os.getenv("VERIFIER_EARLY_EXIT", "").lower() in ("1", "true", "yes")
+
+
 def _extract_claims(
-    content: str, chunks_text: str, event_context: str, client: OpenAI
+    content: str,
+    prompt_prefix: str,
+    client: OpenAI,
+    on_delta: Optional[Callable[[str], None]] = None,
+    early_exit: bool = False,
 ) -> list[Claim]:
     """Extract factual claims from content and verify against sources.
 
     Args:
         content: The draft content to analyze
-        chunks_text: Combined source chunks for verification
-        event_context: Event form data provided by user
+        prompt_prefix: Verifier prompt prefix with the sources and event context
         client: OpenAI client for LLM calls
+        on_delta: Optional callback for each streamed text delta
+        early_exit: Stop reading the response at the first unsupported claim
 
     Returns:
         List of Claim objects with verification status
     """
-    import re
-
-    prompt = get_verifier_prompt(
-        content=content, sources=chunks_text, event_context=event_context
+    prompt = prompt_prefix + get_verifier_prompt_suffix(content)
+
+    claims, _ = _stream_claims(
+        client,
+        {
+            "model": "gpt-4o",
+            "max_tokens": 1500,
+            "messages": [{"role": "user", "content": prompt}],
+        },
+        on_delta,
+        early_exit,
     )
+    return [claim for _, claim in claims]
 
-    response = client.chat.completions.create(
-        model="gpt-4o",
-        max_tokens=1500,
-        messages=[{"role": "user", "content": prompt}],
+
+def _extract_channel_claims(
+    drafts: dict,
+    prompt_prefix: str,
+    client: OpenAI,
+    on_delta: Optional[Callable[[str], None]] = None,
+    early_exit: bool = False,
+) -> dict[str, list[Claim]] | None:
+    """Extract and verify claims for several channels in one LLM call.
+
+    Args:
+        drafts: Channel -> ChannelDraft to verify
+        prompt_prefix: Verifier prompt prefix with the sources and event context
+        client: OpenAI client for LLM calls
+        on_delta: Optional callback for each streamed text delta
+        early_exit: Stop reading the response at the first unsupported claim
+
+    Returns:
+        Channel -> verified claims, or None if the combined prompt is too
+        large for one call or a claim block can't be routed to a channel.
+        If an early exit cut the response off, channels without any claims
+        yet are left out, since the response may not have reached them.
+    """
+    channels = list(drafts)
+    content = "\n\n".join(
+        f"===CHANNEL: {channel}===\n{draft.body}" for channel, draft in drafts.items()
     )
+    prompt = prompt_prefix + get_verifier_prompt_suffix(content, channels)
+    if len(prompt) // 4 > _MAX_BATCH_PROMPT_TOKENS:
+        return None
+
+    claims, cut_off = _stream_claims(
+        client,
+        {
+            "model": "gpt-4o",
+            "max_tokens": min(_MAX_TOKENS_PER_CHANNEL * len(channels), _MAX_OUTPUT_TOKENS),
+            "messages": [{"role": "user", "content": prompt}],
+        },
+        on_delta,
+        early_exit,
+    )
+
+    # Route each claim back to its channel; an untagged block belongs to
+    # the channel of the block before it
+    channel_claims: dict[str, list[Claim]] = {channel: [] for channel in channels}
+    current = None
+    for channel, claim in claims:
+        if channel:
+            current = channel.lower()
+        if current not in channel_claims:
+            # A claim that can't be routed could be an unsupported one;
+            # verify each channel on its own instead
+            return None
+        channel_claims[current].append(claim)
+
+    if cut_off:
+        return {channel: found for channel, found in channel_claims.items() if found}
+    return channel_claims
+
+
+def _stream_claims(
+    client: OpenAI,
+    request: dict,
+    on_delta: Optional[Callable[[str], None]] = None,
+    early_exit: bool = False,
+) -> tuple[list[tuple[Optional[str], Claim]], bool]:
+    """Stream a verifier response, parsing claim blocks as they complete.
+
+    A block is final once the next one has started, so every match but the
+    last is parsed while the response is still arriving.
 
-    response_text = response.choices[0].message.content or ""
-    claims = []
-
-    # Parse claims from verifier response
-    # Format: CLAIM: [text]\nSOURCE: [chunk_id or NONE]\nSUPPORTED: [true/false]
-    claim_blocks = re.split(r'\n---\n|\n\n(?=CLAIM:)', response_text)
-
-    for block in claim_blocks:
-        claim_match = re.search(r'CLAIM:\s*(.+?)(?=\nSOURCE:|\n|$)', block, re.IGNORECASE | re.DOTALL)
-        source_match = re.search(r'SOURCE:\s*(\S+)', block, re.IGNORECASE)
-        supported_match = re.search(r'SUPPORTED:\s*(true|false)', block, re.IGNORECASE)
-
-        if claim_match:
-            claim_text = claim_match.group(1).strip()
-            source_id = source_match.group(1).strip() if source_match else None
-            is_supported = supported_match.group(1).lower() == 'true' if supported_match else False
-
-            # Clean up source_id
-            if source_id and source_id.upper() == 'NONE':
-                source_id = None
-                is_supported = False
-            elif source_id and source_id.lower() == 'user_input':
-                # Keep "user_input" as valid source
-                is_supported = True
-
-            if claim_text and len(claim_text) > 5:  # Filter out very short matches
-                claims.append(Claim(
-                    text=claim_text,
-                    source_chunk_id=source_id,
-                    is_supported=is_supported,
-                ))
-
-    return claims
+    Args:
+        client: OpenAI client for LLM calls
+        request: Keyword arguments for ``client.chat.completions.create``
+        on_delta: Optional callback for each streamed text delta
+        early_exit: Close the stream at the first unsupported claim
+
+    Returns:
+        (channel or None, Claim) for each claim block read, and whether the
+        stream was closed early
+    """
+    claims: list[tuple[Optional[str], Claim]] = []
+    buffer = ""
+    parsed_upto = 0
+
+    stream = client.chat.completions.create(**request, stream=True)
+    for chunk in stream:
+        text = chunk.choices[0].delta.content if chunk.choices else None
+        if not text:
+            continue
+        if on_delta:
+            on_delta(text)
+        buffer += text
+
+        matches = list(_CLAIM_RE.finditer(buffer, parsed_upto))
+        for match in matches[:-1]:
+            parsed_upto = match.end()
+            parsed = _claim_from_match(match)
+            if parsed is None:
+                continue
+            claims.append(parsed)
+            if early_exit and not parsed[1].is_supported:
+                stream.close()
+                return claims, True
+
+    claims.extend(_iter_claims(buffer[parsed_upto:]))
+    return claims, False
+
+
+def _iter_claims(response_text: str) -> Iterator[tuple[Optional[str], Claim]]:
+    """Yield (channel or None, Claim) for each claim block in a verifier response.
+
+    Format: CLAIM: [text]\nSOURCE: [chunk_id or NONE]\nSUPPORTED: [true/false]
+    A missing SOURCE or SUPPORTED line counts as unsupported.
+    """
+    for match in _CLAIM_RE.finditer(response_text):
+        parsed = _claim_from_match(match)
+        if parsed is not None:
+            yield parsed
+
+
+def _claim_from_match(match: re.Match) -> tuple[Optional[str], Claim] | None:
+    """Build (channel or None, Claim) from one claim block, or None if too short."""
+    claim_text = match["claim"].strip().strip("*_").strip()
+    source_id = match["source"]
+    supported = match["supported"]
+    is_supported = supported.lower() == "true" if supported else False
+
+    # Clean up source_id
+    if source_id and source_id.upper() == "NONE":
+        source_id = None
+        is_supported = False
+    elif source_id and source_id.lower() == "user_input":
+        # Keep "user_input" as valid source
+        is_supported = True
+
+    if not claim_text or len(claim_text) <= 5:  # Filter out very short matches
+        return None
+
+    return match["channel"], Claim(
+        text=claim_text,
+        source_chunk_id=source_id,
+        is_supported=is_supported,
+    )
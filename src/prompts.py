@@ -1,8 +1,61 @@
 """All LLM prompts for the Event Content Generator pipeline."""
 
-from typing import Dict, List, Optional
+import functools
+from typing import Dict, List, Optional, Tuple
+
+from .schemas import CHANNEL_CONFIGS, ChannelConfig, ChunkBatch
+
+# JSON object the drafter returns for each channel
+_DRAFT_JSON_SHAPE = """{
+  "headline": "Headline, or null if not applicable for this channel",
+  "subject_line": "Subject line for email, otherwise null",
+  "body": "Your main content here with [source: chunk_id] citations for factual claims",
+  "cta": "Your call-to-action",
+  "claims": [
+    {"text": "Claim 1", "source_chunk_id": "chunk_id"},
+    {"text": "Claim 2", "source_chunk_id": "chunk_id"}
+  ]
+}"""
+
+
+@functools.lru_cache(maxsize=16)
+def get_drafter_system_prompt(
+    brand_context: str,
+    product_context: str,
+    feedback: str = "",
+) -> str:
+    """Generate the system message for the drafter node.
+
+    Holds everything that is identical across channels, so every drafter
+    call in a run shares the same prompt prefix and benefits from the
+    provider's prefix cache.
+
+    Args:
+        brand_context: Retrieved brand voice examples
+        product_context: Retrieved product documentation
+        feedback: Critic feedback from previous iteration (if any)
+
+    Returns:
+        Formatted system prompt string
+    """
+    return f"""You are an expert marketing content writer. You write event promotion content for marketing channels.
+
+## Brand Voice Examples (match this tone and style)
+{brand_context or "No brand examples available - use professional marketing tone."}
+
+## Product/Company Context (use for factual claims)
+{product_context or "No product context available."}
 
-from .schemas import CHANNEL_CONFIGS
+{feedback}
+
+## Instructions
+1. Write compelling content for the requested channel(s) that promotes the event
+2. Match the brand voice from the examples above
+3. Include a clear call-to-action
+4. For ANY factual claim you make, note which source chunk it comes from using [source: chunk_id] format
+5. If you cannot cite a source for a claim, do not make that claim
+6. Stay within the character/word limits for each channel
+"""
 
 
 def get_drafter_prompt(
@@ -12,12 +65,13 @@ def get_drafter_prompt(
     event_date: Optional[str],
     target_audience: str,
     key_messages: List[str],
-    brand_context: str,
-    product_context: str,
-    feedback: str = "",
     relevant_urls: Optional[List[Dict[str, str]]] = None,
 ) -> str:
-    """Generate the prompt for the drafter node.
+    """Generate the per-channel user message for the drafter node.
+
+    Sent after ``get_drafter_system_prompt``. The event details come first
+    so the shared prefix extends into this message; only the channel
+    requirements differ between channels.
 
     Args:
         channel: Marketing channel (linkedin, facebook, email, web)
@@ -26,107 +80,154 @@ def get_drafter_prompt(
         event_date: When the event occurs (optional)
         target_audience: Who this content is for
         key_messages: Key points to communicate
-        brand_context: Retrieved brand voice examples
-        product_context: Retrieved product documentation
-        feedback: Critic feedback from previous iteration (if any)
         relevant_urls: Optional list of URLs to include in content
 
     Returns:
         Formatted prompt string
     """
-    config = CHANNEL_CONFIGS.get(channel, {})
+    config = CHANNEL_CONFIGS.get(channel)
 
     channel_instructions = _get_channel_instructions(channel, config)
 
-    messages_formatted = "\n".join(f"- {msg}" for msg in key_messages)
+    prompt = f"""{_format_event_details(event_title, event_description, event_date, target_audience, tuple(key_messages), _freeze_urls(relevant_urls))}
 
-    prompt = f"""You are an expert marketing content writer. Generate {channel} content for an event promotion.
+## Channel Requirements ({channel.upper()})
+{channel_instructions}
 
-## Event Details
-- **Title:** {event_title}
-- **Description:** {event_description}
-- **Date:** {event_date or "TBD"}
-- **Target Audience:** {target_audience}
+Generate {channel} content for this event.
 
-## Key Messages to Convey
-{messages_formatted}
+## Output Format
+Respond ONLY with a JSON object in this exact shape:
 
-## Channel Requirements ({channel.upper()})
-{channel_instructions}
+{_DRAFT_JSON_SHAPE}
 
-## Brand Voice Examples (match this tone and style)
-{brand_context or "No brand examples available - use professional marketing tone."}
+List all factual claims with their sources in "claims".
+"""
+    return prompt
 
-## Product/Company Context (use for factual claims)
-{product_context or "No product context available."}
 
-## Relevant URLs (include naturally in CTAs and body where appropriate)
-{format_urls_for_prompt(relevant_urls) if relevant_urls else "No URLs provided - use generic CTA language."}
+def get_batched_drafter_prompt(
+    channels: List[str],
+    event_title: str,
+    event_description: str,
+    event_date: Optional[str],
+    target_audience: str,
+    key_messages: List[str],
+    relevant_urls: Optional[List[Dict[str, str]]] = None,
+) -> str:
+    """Generate a single drafter user message covering several channels.
 
-{feedback}
+    Same inputs as ``get_drafter_prompt``, but the model returns one JSON
+    object keyed by channel.
 
-## Instructions
-1. Write compelling {channel} content that promotes this event
-2. Match the brand voice from the examples above
-3. Include a clear call-to-action
-4. For ANY factual claim you make, note which source chunk it comes from using [source: chunk_id] format
-5. If you cannot cite a source for a claim, do not make that claim
-6. Stay within the character/word limits for this channel
+    Args:
+        channels: Marketing channels to draft
+        (remaining args as in ``get_drafter_prompt``)
 
-## Output Format
-Provide your response in this exact format:
+    Returns:
+        Formatted prompt string
+    """
+    channel_sections = "\n".join(
+        f"### {channel.upper()}{_get_channel_instructions(channel, CHANNEL_CONFIGS.get(channel))}"
+        for channel in channels
+    )
+    channel_shape = _DRAFT_JSON_SHAPE.replace("\n", "\n  ")
+
+    return f"""{_format_event_details(event_title, event_description, event_date, target_audience, tuple(key_messages), _freeze_urls(relevant_urls))}
 
-HEADLINE: (if applicable for this channel)
-SUBJECT: (for email only)
-BODY:
-[Your main content here with [source: chunk_id] citations for factual claims]
+## Channel Requirements
+{channel_sections}
+
+Generate content for each of these channels.
+
+CHANNELS: {", ".join(channels)}
+
+## Output Format
+Respond ONLY with a JSON object with one key per channel ({", ".join(channels)}), each in this exact shape:
 
-CTA: [Your call-to-action]
+{{
+  "<channel>": {channel_shape}
+}}
 
-CLAIMS:
-- Claim 1 [source: chunk_id]
-- Claim 2 [source: chunk_id]
-(List all factual claims with their sources)
+List all factual claims with their sources in each channel's "claims".
 """
-    return prompt
 
 
-def _get_channel_instructions(channel: str, config: Dict) -> str:
+@functools.lru_cache(maxsize=64)
+def _format_event_details(
+    event_title: str,
+    event_description: str,
+    event_date: Optional[str],
+    target_audience: str,
+    key_messages: Tuple[str, ...],
+    relevant_urls: Optional[Tuple[Tuple[Tuple[str, str], ...], ...]],
+) -> str:
+    """Format the event sections shared by every drafter user message.
+
+    Cached, so each channel and each re-draft reuses the same text; list
+    arguments are passed as tuples (see ``_freeze_urls``).
+    """
+    messages_formatted = "\n".join(f"- {msg}" for msg in key_messages)
+
+    return f"""## Event Details
+- **Title:** {event_title}
+- **Description:** {event_description}
+- **Date:** {event_date or "TBD"}
+- **Target Audience:** {target_audience}
+
+## Key Messages to Convey
+{messages_formatted}
+
+## Relevant URLs (include naturally in CTAs and body where appropriate)
+{format_urls_for_prompt([dict(url) for url in relevant_urls]) if relevant_urls else "No URLs provided - use generic CTA language."}"""
+
+
+def _freeze_urls(
+    urls: Optional[List[Dict[str, str]]],
+) -> Optional[Tuple[Tuple[Tuple[str, str], ...], ...]]:
+    """Convert URL dicts to nested tuples so they can be a cache key."""
+    if urls is None:
+        return None
+    return tuple(tuple(url.items()) for url in urls)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_channel_instructions(channel: str, config: Optional[ChannelConfig]) -> str:
     """Get channel-specific formatting instructions."""
     if channel == "linkedin":
         return f"""
-- Maximum {config.get('max_length', 3000)} characters
-- Tone: {config.get('tone', 'Professional, thought-leadership')}
-- Required elements: {', '.join(config.get('required_elements', []))}
+- Maximum {config.max_length} characters
+- Tone: {config.tone}
+- Required elements: {', '.join(config.required_elements)}
 - Use 1-2 relevant hashtags at the end
 - Open with a hook that grabs attention
 - Include clear value proposition
 """
     elif channel == "facebook":
         return f"""
-- Maximum {config.get('max_length', 500)} characters
-- Tone: {config.get('tone', 'Conversational, engaging')}
-- Required elements: {', '.join(config.get('required_elements', []))}
+- Maximum {config.max_length} characters
+- Tone: {config.tone}
+- Required elements: {', '.join(config.required_elements)}
 - Keep it short and punchy
 - Use conversational language
 - Include an emoji or two if appropriate
 """
     elif channel == "email":
         return f"""
-- Subject line: Maximum {config.get('subject_max_length', 60)} characters
-- Body: Maximum {config.get('body_max_words', 300)} words
-- Tone: {config.get('tone', 'Direct, personalized')}
-- Required elements: {', '.join(config.get('required_elements', []))}
+- Subject line: Maximum {config.subject_max_length} characters
+- Body: Maximum {config.body_max_words} words
+- Tone: {config.tone}
+- Required elements: {', '.join(config.required_elements)}
 - Write a compelling subject line
 - Open with personalization if possible
 - Keep paragraphs short (2-3 sentences)
 """
     elif channel == "web":
         return f"""
-- Headline: Maximum {config.get('headline_max_words', 10)} words
-- Hero paragraph: Maximum {config.get('hero_max_words', 50)} words
-- Tone: {config.get('tone', 'SEO-friendly, benefit-driven')}
-- Required elements: {', '.join(config.get('required_elements', []))}
+- Headline: Maximum {config.headline_max_words} words
+- Hero paragraph: Maximum {config.hero_max_words} words
+- Tone: {config.tone}
+- Required elements: {', '.join(config.required_elements)}
 - Focus on benefits, not features
 - Use action-oriented language
 - Optimize for scanning
@@ -178,39 +279,59 @@ def get_critic_prompt(
 - Web hero: Max 50 words
 
 ## Output Format
-Provide your evaluation in this exact format:
-
-BRAND_VOICE_SCORE: [0-10]
-CTA_CLARITY_SCORE: [0-10]
-LENGTH_OK: [true/false]
-
-ISSUES:
-- [List specific problems found]
-- [One issue per line]
-
-FIXES:
-- [Actionable suggestion for each issue]
-- [One fix per line]
-
-PASSED: [true if brand_voice >= 7 AND cta_clarity >= 7 AND length_ok, else false]
+Respond ONLY with a JSON object in this exact shape:
+
+{{
+  "brand_voice_score": 0-10,
+  "cta_clarity_score": 0-10,
+  "length_ok": true or false,
+  "issues": ["Specific problem found", "One issue per entry"],
+  "fixes": ["Actionable suggestion for each issue", "One fix per entry"],
+  "affected_channels": ["Channels ({', '.join(channels)}) whose drafts need revision"],
+  "passed": true if brand_voice >= 7 AND cta_clarity >= 7 AND length_ok, else false
+}}
 """
 
 
-def get_verifier_prompt(content: str, sources: str, event_context: str = "") -> str:
+def get_verifier_prompt(
+    content: str,
+    sources: str,
+    event_context: str = "",
+    channels: Optional[List[str]] = None,
+) -> str:
     """Generate the prompt for the verifier node.
 
     Args:
         content: Draft content to verify
         sources: All available source chunks
         event_context: User-provided event form data
+        channels: If given, ``content`` holds several channels, each under a
+            ``===CHANNEL: name===`` header, and every claim block is tagged
+            with its channel
 
     Returns:
         Formatted prompt string
     """
-    return f"""You are a fact-checker. Extract all factual claims from the content and verify each against the available sources.
+    return get_verifier_prompt_prefix(sources, event_context) + get_verifier_prompt_suffix(
+        content, channels
+    )
 
-## Content to Verify
-{content}
+
+@functools.lru_cache(maxsize=8)
+def get_verifier_prompt_prefix(sources: str, event_context: str = "") -> str:
+    """Generate the verifier prompt's sources section.
+
+    It is identical for every verifier call in a run and comes first, so
+    OpenAI's automatic prompt caching can reuse it across calls.
+
+    Args:
+        sources: All available source chunks
+        event_context: User-provided event form data
+
+    Returns:
+        Prompt prefix string
+    """
+    return f"""You are a fact-checker. Extract all factual claims from the content below and verify each against the available sources.
 
 ## Source Type 1: Corpus Documents
 IMPORTANT: Corpus sources are formatted as [chunk_id]: followed by the text content.
@@ -225,6 +346,31 @@ Claims derived from this data should use SOURCE: user_input
 
 {event_context}
 
+"""
+
+
+def get_verifier_prompt_suffix(content: str, channels: Optional[List[str]] = None) -> str:
+    """Generate the verifier prompt's content and instructions section.
+
+    Args:
+        content: Draft content to verify
+        channels: See ``get_verifier_prompt``
+
+    Returns:
+        Prompt suffix string
+    """
+    channel_line = "CHANNEL: [channel the claim appears in]\n" if channels else ""
+    channel_instruction = (
+        f"5. The content covers several channels ({', '.join(channels)}), each under a "
+        "===CHANNEL: name=== header. Start every claim block with a CHANNEL: line naming "
+        "the channel it appears in; repeat a claim for each channel that makes it\n"
+        if channels else ""
+    )
+    example_channel = "CHANNEL: linkedin\n" if channels else ""
+
+    return f"""## Content to Verify
+{content}
+
 ## Instructions
 1. Identify every factual claim in the content (statements that could be true or false)
 2. For each claim, check BOTH source types:
@@ -233,33 +379,33 @@ Claims derived from this data should use SOURCE: user_input
    - If the claim matches neither: use "NONE"
 3. A claim is SUPPORTED if it comes from either corpus OR user_input
 4. A claim is UNSUPPORTED only if it matches neither source
-
+{channel_instruction}
 Note: Opinions, calls-to-action, and general marketing statements are NOT factual claims.
 
 ## Example Output
 
-CLAIM: The event is on January 15, 2026
+{example_channel}CLAIM: The event is on January 15, 2026
 SOURCE: user_input
 SUPPORTED: true
 
 ---
 
-CLAIM: Teams can reduce review time by 50%
+{example_channel}CLAIM: Teams can reduce review time by 50%
 SOURCE: chunk_ed531959
 SUPPORTED: true
 
 ---
 
-CLAIM: The platform was founded in 2019
+{example_channel}CLAIM: The platform was founded in 2019
 SOURCE: NONE
 SUPPORTED: false
 
 ---
 
 ## Your Output
-Now analyze the content above. For each factual claim found:
+Now analyze the content to verify. For each factual claim found:
 
-CLAIM: [The factual statement]
+{channel_line}CLAIM: [The factual statement]
 SOURCE: [chunk_id, "user_input", or "NONE"]
 SUPPORTED: [true/false]
 
@@ -327,3 +473,19 @@ def format_urls_for_prompt(urls: List[Dict[str, str]]) -> str:
         lines.append(f"- {label}: {url}")
 
     return "\n".join(lines)
+
+
+def format_chunks_for_prompt(*batches: Optional[ChunkBatch]) -> str:
+    """Format retrieved chunks as "[chunk_id]: text" blocks for a prompt.
+
+    Args:
+        *batches: Chunk batches to include, in order (None is skipped)
+
+    Returns:
+        Formatted string for prompt inclusion
+    """
+    return "\n\n".join(
+        f"[{chunk_id}]: {text}"
+        for batch in batches if batch
+        for chunk_id, text in zip(batch["ids"], batch["texts"])
+    )
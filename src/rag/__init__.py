@@ -1,10 +1,12 @@
 """RAG components for corpus ingestion and retrieval."""
 
 from .ingest import ingest_documents, load_corpus
-from .retrieve import retrieve_chunks
+from .retrieve import embed_query, retrieve_all_chunks, retrieve_chunks
 
 __all__ = [
+    "embed_query",
     "ingest_documents",
     "load_corpus",
+    "retrieve_all_chunks",
     "retrieve_chunks",
 ]
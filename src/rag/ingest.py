@@ -7,7 +7,13 @@ import os
 from pathlib import Path
 
 import chromadb
-from chromadb.utils import embedding_functions
+
+from .retrieve import (
+    CHUNK_KINDS,
+    CORPUS_COLLECTION,
+    clear_retrieval_cache,
+    get_embedding_function,
+)
 
 
 def get_chroma_client() -> chromadb.ClientAPI:
@@ -16,11 +22,6 @@ def get_chroma_client() -> chromadb.ClientAPI:
     return chromadb.PersistentClient(path=persist_dir)
 
 
-def get_embedding_function():
-    """Get the default embedding function (uses sentence-transformers locally)."""
-    return embedding_functions.DefaultEmbeddingFunction()
-
-
 def load_corpus(corpus_dir: str = "corpus") -> list[dict]:
     """Load all documents from the corpus directory.
 
@@ -137,9 +138,13 @@ def ingest_documents(
 ) -> dict:
     """Ingest all documents from corpus into ChromaDB.
 
+    All chunks go into the one corpus collection, each flagged with the
+    kinds it serves: brand_voice, product_docs, or both for general
+    documents.
+
     Args:
         corpus_dir: Path to corpus directory
-        force_reingest: If True, delete existing collections first
+        force_reingest: If True, delete the existing collection first
 
     Returns:
         Dict with ingestion statistics
@@ -153,79 +158,54 @@ def ingest_documents(
     if not documents:
         return {"status": "warning", "message": "No documents found in corpus"}
 
-    # Separate by type
-    brand_docs = [d for d in documents if d["type"] == "brand_voice"]
-    product_docs = [d for d in documents if d["type"] == "product_docs"]
-    general_docs = [d for d in documents if d["type"] == "general"]
-
-    stats = {"brand_voice": 0, "product_docs": 0, "general": 0}
-
-    # Ingest brand voice documents
-    if brand_docs or force_reingest:
-        stats["brand_voice"] = _ingest_collection(
-            client,
-            embed_fn,
-            "brand_voice",
-            brand_docs + general_docs,  # Include general in brand
-            force_reingest,
-        )
-
-    # Ingest product documents
-    if product_docs or force_reingest:
-        stats["product_docs"] = _ingest_collection(
-            client,
-            embed_fn,
-            "product_docs",
-            product_docs + general_docs,  # Include general in product
-            force_reingest,
-        )
-
-    return {"status": "success", "chunks_ingested": stats}
-
-
-def _ingest_collection(
-    client: chromadb.ClientAPI,
-    embed_fn,
-    collection_name: str,
-    documents: list,
-    force_reingest: bool,
-) -> int:
-    """Ingest documents into a specific collection.
-
-    Returns:
-        Number of chunks ingested
-    """
     if force_reingest:
-        try:
-            client.delete_collection(collection_name)
-        except Exception:
-            pass  # Collection doesn't exist
+        # Also drop the per-kind collections used before the corpus collection
+        for collection_name in (CORPUS_COLLECTION, *CHUNK_KINDS):
+            try:
+                client.delete_collection(collection_name)
+            except Exception:
+                pass  # Collection doesn't exist
 
     collection = client.get_or_create_collection(
-        name=collection_name,
+        name=CORPUS_COLLECTION,
         embedding_function=embed_fn,
         metadata={"hnsw:space": "cosine"},
     )
 
-    # Chunk all documents
+    # Chunk all documents, flagging each chunk with its kinds
     all_chunks = []
     for doc in documents:
-        chunks = chunk_document(doc["content"], doc["source"])
-        all_chunks.extend(chunks)
-
-    if not all_chunks:
-        return 0
-
-    # Prepare data for ChromaDB
-    texts = [chunk["text"] for chunk in all_chunks]
-    ids = [chunk["id"] for chunk in all_chunks]
-    metadatas = [{"source": chunk["source"]} for chunk in all_chunks]
-
-    # Add to collection (ChromaDB will generate embeddings automatically)
-    collection.add(
-        ids=ids,
-        documents=texts,
-        metadatas=metadatas,
-    )
+        kinds = CHUNK_KINDS if doc["type"] == "general" else (doc["type"],)
+        for chunk in chunk_document(doc["content"], doc["source"]):
+            chunk["kinds"] = kinds
+            all_chunks.append(chunk)
 
-    return len(all_chunks)
+    stats = {"brand_voice": 0, "product_docs": 0, "general": 0}
+
+    if all_chunks:
+        # Prepare data for ChromaDB
+        texts = [chunk["text"] for chunk in all_chunks]
+        ids = [chunk["id"] for chunk in all_chunks]
+        metadatas = [
+            {
+                "source": chunk["source"],
+                "chunk_id": chunk["id"],
+                **{kind: kind in chunk["kinds"] for kind in CHUNK_KINDS},
+            }
+            for chunk in all_chunks
+        ]
+
+        # Add to collection (ChromaDB will generate embeddings automatically)
+        collection.add(
+            ids=ids,
+            documents=texts,
+            metadatas=metadatas,
+        )
+
+        for kind in CHUNK_KINDS:
+            stats[kind] = sum(kind in chunk["kinds"] for chunk in all_chunks)
+
+    # Cached results may point at chunks that changed
+    clear_retrieval_cache()
+
+    return {"status": "success", "chunks_ingested": stats}
@@ -2,165 +2,484 @@
 
 from __future__ import annotations
 
+import functools
+import hashlib
+import logging
 import os
+import threading
+import time
+from collections import deque
 
 import chromadb
+import diskcache
+import numpy as np
+from chromadb.api.models.Collection import Collection
+from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
 from chromadb.utils import embedding_functions
 
+from ..llm_cache import cache_disabled
+from ..schemas import ChunkBatch
+
+logger = logging.getLogger(__name__)
+
+_embedding_cache: diskcache.Cache | None = None
+
+# Shared ChromaDB handles, opened on first use (RLock: getters nest)
+_client: chromadb.ClientAPI | None = None
+_embedding_function = None
+_collections: dict[str, Collection] = {}
+_handles_lock = threading.RLock()
+
+# Collections known to have data, and empty ones with when to re-check them
+_EMPTY_RECHECK_SECONDS = 60.0
+_nonempty_collections: set[str] = set()
+_empty_collections: dict[str, float] = {}
+
+# Every chunk is stored in one collection, with a boolean metadata flag for
+# each kind it serves; general documents are flagged as both
+CORPUS_COLLECTION = "corpus"
+CHUNK_KINDS = ("brand_voice", "product_docs")
+
+# onnxruntime providers for the embedder, in order of preference
+_ONNX_PROVIDERS = ("CUDAExecutionProvider", "CPUExecutionProvider")
+
+# Recent results keyed by query embedding, reused for near-duplicate queries:
+# (float16 unit query vector, kind, top_k, expires_at, chunks)
+_SEMANTIC_CACHE_SIZE = 128
+_SEMANTIC_CACHE_TTL = 3600.0
+_SEMANTIC_CACHE_MIN_SIMILARITY = 0.97
+_semantic_cache: deque[tuple[np.ndarray, str, int, float, ChunkBatch]] = deque(
+    maxlen=_SEMANTIC_CACHE_SIZE
+)
+_semantic_cache_lock = threading.Lock()
+
 
 def get_chroma_client() -> chromadb.ClientAPI:
-    """Get the ChromaDB client."""
-    persist_dir = os.getenv("CHROMA_PERSIST_DIRECTORY", "./chroma_db")
-    return chromadb.PersistentClient(path=persist_dir)
+    """Get the shared ChromaDB client, opening it on first use."""
+    global _client
+    if _client is None:
+        with _handles_lock:
+            if _client is None:
+                persist_dir = os.getenv("CHROMA_PERSIST_DIRECTORY", "./chroma_db")
+                _client = chromadb.PersistentClient(path=persist_dir)
+    return _client
+
+
+class _SharedSessionEmbeddingFunction(EmbeddingFunction[Documents]):
+    """Chroma's default embedder (ONNX all-MiniLM-L6-v2) with one long-lived session.
+
+    ``DefaultEmbeddingFunction`` builds a new ``ONNXMiniLM_L6_V2``, and with
+    it a new inference session, on every call. This keeps a single instance,
+    which embeds in batches of 32 and runs on CUDA when onnxruntime has it.
+    It reports the "default" name and config, so existing collections accept
+    it. It must not subclass ``DefaultEmbeddingFunction``: collections skip
+    any instance of that class and embed with a fresh default embedder.
+    """
+
+    def __init__(self) -> None:
+        import onnxruntime
+
+        available = set(onnxruntime.get_available_providers())
+        self._onnx = embedding_functions.ONNXMiniLM_L6_V2(
+            preferred_providers=[p for p in _ONNX_PROVIDERS if p in available]
+        )
+
+    def __call__(self, input: Documents) -> Embeddings:
+        return self._onnx(input)
+
+    @staticmethod
+    def name() -> str:
+        return embedding_functions.DefaultEmbeddingFunction.name()
+
+    def get_config(self) -> dict:
+        return {}
+
+    @staticmethod
+    def build_from_config(config: dict) -> "_SharedSessionEmbeddingFunction":
+        return _SharedSessionEmbeddingFunction()
+
+    def max_tokens(self) -> int:
+        return 256
 
 
 def get_embedding_function():
-    """Get the default embedding function (uses sentence-transformers locally)."""
-    return embedding_functions.DefaultEmbeddingFunction()
+    """Get the shared default embedding function (ONNX MiniLM, runs locally)."""
+    global _embedding_function
+    if _embedding_function is None:
+        with _handles_lock:
+            if _embedding_function is None:
+                _embedding_function = _SharedSessionEmbeddingFunction()
+    return _embedding_function
+
+
+def _get_collection(collection_name: str) -> Collection:
+    """Get a collection handle, creating the collection and caching the handle."""
+    collection = _collections.get(collection_name)
+    if collection is None:
+        with _handles_lock:
+            collection = _collections.get(collection_name)
+            if collection is None:
+                collection = get_chroma_client().get_or_create_collection(
+                    name=collection_name,
+                    embedding_function=get_embedding_function(),
+                    metadata={"hnsw:space": "cosine"},
+                )
+                _collections[collection_name] = collection
+    return collection
+
+
+def get_embedding_cache() -> diskcache.Cache:
+    """Get the on-disk query embedding cache, opening it on first use."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        cache_dir = os.getenv("EMBEDDING_CACHE_DIRECTORY", "./.cache/embeddings")
+        _embedding_cache = diskcache.Cache(cache_dir)
+    return _embedding_cache
+
+
+@functools.lru_cache(maxsize=512)
+def embed_query(query: str) -> np.ndarray:
+    """Embed a search query once so it can be reused across collections.
+
+    Vectors are cached in memory and on disk, keyed by a SHA-256 of the
+    embedding model name and the query, so re-running the same event
+    skips the model entirely.
+    """
+    embed_fn = get_embedding_function()
+    if cache_disabled():
+        vector = np.asarray(embed_fn([query])[0], dtype=np.float32)
+    else:
+        key = hashlib.sha256(f"{embed_fn.name()}|{query}".encode()).hexdigest()
+        cache = get_embedding_cache()
+
+        vector = cache.get(key)
+        # Re-embed entries that older versions stored as float16
+        if vector is None or vector.dtype != np.float32:
+            vector = np.asarray(embed_fn([query])[0], dtype=np.float32)
+            cache.set(key, vector)
+
+    vector.setflags(write=False)
+    return vector
 
 
 def retrieve_chunks(
     query: str,
-    collection_name: str = "brand_voice",
+    kind: str = "brand_voice",
     top_k: int = 5,
-) -> list[dict]:
-    """Retrieve relevant chunks from the vector store.
+    query_embedding: np.ndarray | None = None,
+) -> ChunkBatch:
+    """Retrieve relevant chunks of one kind from the vector store.
 
     Args:
         query: The search query
-        collection_name: Which collection to search
+        kind: Which kind of chunk to search (brand_voice or product_docs)
         top_k: Number of results to return
+        query_embedding: Precomputed embedding of ``query`` (see
+            ``embed_query``); if omitted, ChromaDB embeds the query text
+
+    Returns:
+        ChunkBatch with parallel 'ids', 'texts' and 'sources' lists
+    """
+    return retrieve_all_chunks(query, (kind,), top_k, query_embedding)[kind]
+
+
+def retrieve_all_chunks(
+    query: str,
+    kinds: tuple[str, ...] = CHUNK_KINDS,
+    top_k: int = 5,
+    query_embedding: np.ndarray | None = None,
+) -> dict[str, ChunkBatch]:
+    """Retrieve the top chunks of several kinds with one vector store query.
+
+    Every kind lives in the single corpus collection, so one query over
+    ``top_k`` per kind is split client-side. A kind crowded out of those
+    results gets a follow-up query filtered to it alone.
+
+    Args:
+        query: The search query
+        kinds: Which kinds of chunk to search
+        top_k: Number of results to return per kind
+        query_embedding: Precomputed embedding of ``query`` (see
+            ``embed_query``); if omitted, ChromaDB embeds the query text
 
     Returns:
-        List of chunk dicts with 'id', 'text', 'source' keys
+        Kind -> ChunkBatch with parallel 'ids', 'texts' and 'sources' lists
     """
     try:
-        client = get_chroma_client()
-        embed_fn = get_embedding_function()
-
-        # Get or create collection with embedding function
-        collection = client.get_or_create_collection(
-            name=collection_name,
-            embedding_function=embed_fn,
-            metadata={"hnsw:space": "cosine"},
-        )
+        collection = _get_collection(CORPUS_COLLECTION)
 
         # Check if collection is empty
-        if collection.count() == 0:
-            return _get_fallback_chunks(collection_name)
-
-        # Search using query text (ChromaDB will embed it automatically)
+        if _collection_is_empty(CORPUS_COLLECTION, collection):
+            return {kind: _get_fallback_chunks(kind) for kind in kinds}
+
+        # Search with the precomputed embedding, or let ChromaDB embed the text
+        if query_embedding is not None:
+            unit_vector = _unit_vector(query_embedding)
+            cached = {
+                kind: _semantic_cache_lookup(unit_vector, kind, top_k) for kind in kinds
+            }
+            if all(batch is not None for batch in cached.values()):
+                return cached
+            query_kwargs = {"query_embeddings": [query_embedding]}
+        else:
+            query_kwargs = {"query_texts": [query]}
+
+        n_results = top_k * len(kinds)
         results = collection.query(
-            query_texts=[query],
-            n_results=top_k,
+            **query_kwargs,
+            n_results=n_results,
+            where=_kind_filter(kinds),
             include=["documents", "metadatas"],
         )
+        batches = _split_by_kind(results, kinds, top_k)
+
+        # Fewer results than asked for means every matching chunk was seen
+        if len(results["ids"][0]) == n_results:
+            for kind in kinds:
+                if len(batches[kind]["ids"]) < top_k:
+                    kind_results = collection.query(
+                        **query_kwargs,
+                        n_results=top_k,
+                        where=_kind_filter((kind,)),
+                        include=["documents", "metadatas"],
+                    )
+                    batches[kind] = _split_by_kind(kind_results, (kind,), top_k)[kind]
+
+        for kind, batch in batches.items():
+            if not batch["ids"]:
+                batches[kind] = _get_fallback_chunks(kind)
+            elif query_embedding is not None:
+                _semantic_cache_store(unit_vector, kind, top_k, batch)
+
+        return batches
 
-        # Format results
-        chunks = []
-        for i, doc_id in enumerate(results["ids"][0]):
-            chunks.append(
-                {
-                    "id": doc_id,
-                    "text": results["documents"][0][i],
-                    "source": results["metadatas"][0][i].get("source", "unknown"),
-                }
-            )
+    except Exception as e:
+        logger.warning("Retrieval failed: %s", e)
+        _forget_collection(CORPUS_COLLECTION)
+        return {kind: _get_fallback_chunks(kind) for kind in kinds}
 
-        return chunks
 
-    except Exception as e:
-        print(f"Warning: Retrieval failed: {e}")
-        return _get_fallback_chunks(collection_name)
+def _kind_filter(kinds: tuple[str, ...]) -> dict:
+    """Build a Chroma ``where`` filter matching chunks of any of the given kinds."""
+    if len(kinds) == 1:
+        return {kinds[0]: True}
+    return {"$or": [{kind: True} for kind in kinds]}
+
+
+def _split_by_kind(
+    results: dict, kinds: tuple[str, ...], top_k: int
+) -> dict[str, ChunkBatch]:
+    """Partition a query's results into up to ``top_k`` chunks per kind, in rank order.
+
+    A chunk flagged with several kinds (general documents) counts for each.
+    """
+    batches: dict[str, ChunkBatch] = {
+        kind: {"ids": [], "texts": [], "sources": []} for kind in kinds
+    }
+    for chunk_id, text, metadata in zip(
+        results["ids"][0], results["documents"][0], results["metadatas"][0]
+    ):
+        for kind in kinds:
+            batch = batches[kind]
+            if metadata.get(kind) and len(batch["ids"]) < top_k:
+                batch["ids"].append(chunk_id)
+                batch["texts"].append(text)
+                batch["sources"].append(metadata.get("source", "unknown"))
+    return batches
+
+
+def clear_retrieval_cache() -> None:
+    """Forget cached results and collection handles, e.g. after re-ingesting.
+
+    Re-ingesting can delete and recreate collections, which invalidates
+    any handle held from before.
+    """
+    with _semantic_cache_lock:
+        _semantic_cache.clear()
+    with _handles_lock:
+        _collections.clear()
+        _nonempty_collections.clear()
+        _empty_collections.clear()
+
+
+def _forget_collection(collection_name: str) -> None:
+    """Drop a collection's cached handle and emptiness state after a failure.
+
+    The collection may have been deleted and recreated by an ingest in
+    another process; the next call then fetches a fresh handle.
+    """
+    with _handles_lock:
+        _collections.pop(collection_name, None)
+        _nonempty_collections.discard(collection_name)
+        _empty_collections.pop(collection_name, None)
+
+
+def _collection_is_empty(collection_name: str, collection: Collection) -> bool:
+    """Check whether a collection is empty, skipping ``count()`` when known.
+
+    Non-empty collections stay non-empty until the next ingest (which
+    clears this cache); an empty result is trusted for
+    ``_EMPTY_RECHECK_SECONDS`` so data ingested elsewhere still shows up.
+    """
+    if collection_name in _nonempty_collections:
+        return False
+    if _empty_collections.get(collection_name, 0.0) > time.monotonic():
+        return True
+
+    if collection.count() > 0:
+        _nonempty_collections.add(collection_name)
+        _empty_collections.pop(collection_name, None)
+        return False
+    _empty_collections[collection_name] = time.monotonic() + _EMPTY_RECHECK_SECONDS
+    return True
+
+
+def _unit_vector(vector) -> np.ndarray:
+    """Normalize an embedding so a dot product gives cosine similarity."""
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
 
+def _semantic_cache_lookup(
+    unit_vector: np.ndarray, kind: str, top_k: int
+) -> ChunkBatch | None:
+    """Return cached chunks for a near-identical query, if any.
 
-def _get_fallback_chunks(collection_name: str) -> list[dict]:
+    A hit needs the same kind and top_k, an unexpired entry, and a
+    cosine similarity above ``_SEMANTIC_CACHE_MIN_SIMILARITY``.
+    """
+    if cache_disabled():
+        return None
+
+    now = time.monotonic()
+    with _semantic_cache_lock:
+        entries = [
+            entry for entry in _semantic_cache
+            if entry[1] == kind and entry[2] == top_k and entry[3] > now
+        ]
+    if not entries:
+        return None
+
+    vectors = np.stack([entry[0] for entry in entries]).astype(np.float32)
+    similarities = vectors @ unit_vector
+    best = int(np.argmax(similarities))
+    if similarities[best] < _SEMANTIC_CACHE_MIN_SIMILARITY:
+        return None
+    chunks = entries[best][4]
+    return {
+        "ids": list(chunks["ids"]),
+        "texts": list(chunks["texts"]),
+        "sources": list(chunks["sources"]),
+    }
+
+
+def _semantic_cache_store(
+    unit_vector: np.ndarray, kind: str, top_k: int, chunks: ChunkBatch
+) -> None:
+    """Remember a query's results for later near-duplicate queries.
+
+    The vector is kept as float16; the similarity threshold is far coarser
+    than the rounding.
+    """
+    expires_at = time.monotonic() + _SEMANTIC_CACHE_TTL
+    entry = (unit_vector.astype(np.float16), kind, top_k, expires_at, chunks)
+    with _semantic_cache_lock:
+        _semantic_cache.append(entry)
+
+
+def _fallback_enabled() -> bool:
+    """Whether placeholder chunks stand in for missing context.
+
+    On by default; set RETRIEVAL_FALLBACK_ENABLED=false to turn it off.
+    """
+    enabled = os.getenv("RETRIEVAL_FALLBACK_ENABLED", "true")
+    return enabled.lower() in ("1", "true", "yes")
+
+
+def _get_fallback_chunks(kind: str) -> ChunkBatch:
     """Return fallback chunks when the vector store is empty or unavailable.
 
-    This ensures the pipeline can still run for testing/demo purposes.
+    This ensures the pipeline can still run for testing/demo purposes. With
+    RETRIEVAL_FALLBACK_ENABLED=false the batch is empty instead, so made-up
+    context never reaches the prompts.
     """
-    if collection_name == "brand_voice":
-        return [
-            {
-                "id": "fallback_brand_1",
-                "text": """Our brand voice is confident yet approachable. We speak
+    if not _fallback_enabled():
+        return {"ids": [], "texts": [], "sources": []}
+
+    if kind == "brand_voice":
+        return {
+            "ids": ["fallback_brand_1", "fallback_brand_2"],
+            "texts": [
+                """Our brand voice is confident yet approachable. We speak
                 directly to our audience as peers, not as authorities lecturing
                 from above. Use active voice, concrete examples, and avoid jargon
                 unless our audience uses it daily.""",
-                "source": "fallback",
-            },
-            {
-                "id": "fallback_brand_2",
-                "text": """When writing calls-to-action, be specific about the benefit.
+                """When writing calls-to-action, be specific about the benefit.
                 Don't say 'Learn more' - say 'See how teams cut review time by 50%'.
                 Every CTA should answer the reader's question: 'What's in it for me?'""",
-                "source": "fallback",
-            },
-        ]
-    elif collection_name == "product_docs":
-        return [
-            {
-                "id": "fallback_product_1",
-                "text": """Our platform helps teams collaborate more effectively.
+            ],
+            "sources": ["fallback", "fallback"],
+        }
+    elif kind == "product_docs":
+        return {
+            "ids": ["fallback_product_1"],
+            "texts": [
+                """Our platform helps teams collaborate more effectively.
                 Key features include real-time editing, version control, and
                 seamless integrations with existing workflows.""",
-                "source": "fallback",
-            },
-        ]
+            ],
+            "sources": ["fallback"],
+        }
     else:
-        return []
+        return {"ids": [], "texts": [], "sources": []}
 
 
 def search_similar_chunks(
     chunk_id: str,
-    collection_name: str = "brand_voice",
+    kind: str = "brand_voice",
     top_k: int = 3,
-) -> list[dict]:
+) -> ChunkBatch:
     """Find chunks similar to a given chunk.
 
     Useful for finding additional context around a specific source.
 
     Args:
         chunk_id: ID of the chunk to find similar content for
-        collection_name: Which collection to search
+        kind: Which kind of chunk to search
         top_k: Number of results to return
 
     Returns:
-        List of similar chunk dicts
+        ChunkBatch of similar chunks, excluding the chunk itself
     """
     try:
-        client = get_chroma_client()
-        embed_fn = get_embedding_function()
-
-        collection = client.get_collection(collection_name, embedding_function=embed_fn)
+        collection = _get_collection(CORPUS_COLLECTION)
 
         # Get the original chunk
         original = collection.get(ids=[chunk_id], include=["embeddings"])
 
-        if not original["embeddings"]:
-            return []
+        if original["embeddings"] is None or len(original["embeddings"]) == 0:
+            return {"ids": [], "texts": [], "sources": []}
 
-        # Search for similar
+        # Search for similar, excluding the original via its chunk_id metadata
         results = collection.query(
             query_embeddings=original["embeddings"],
-            n_results=top_k + 1,  # +1 because it will include itself
+            n_results=top_k,
+            where={
+                "$and": [{"chunk_id": {"$ne": chunk_id}}, _kind_filter((kind,))]
+            },
             include=["documents", "metadatas"],
         )
 
-        # Format and filter out the original
-        chunks = []
-        for i, doc_id in enumerate(results["ids"][0]):
-            if doc_id != chunk_id:
-                chunks.append(
-                    {
-                        "id": doc_id,
-                        "text": results["documents"][0][i],
-                        "source": results["metadatas"][0][i].get("source", "unknown"),
-                    }
-                )
-
-        return chunks[:top_k]
+        return {
+            "ids": list(results["ids"][0]),
+            "texts": list(results["documents"][0]),
+            "sources": [
+                metadata.get("source", "unknown") for metadata in results["metadatas"][0]
+            ],
+        }
 
     except Exception as e:
-        print(f"Warning: Similar search failed: {e}")
-        return []
+        logger.warning("Similar search failed: %s", e)
+        _forget_collection(CORPUS_COLLECTION)
+        return {"ids": [], "texts": [], "sources": []}
@@ -1,6 +1,8 @@
 """Pydantic models and state schema for the Event Content Generator."""
 
-from typing import Any, Dict, List, Literal, Optional, TypedDict
+import operator
+from dataclasses import dataclass
+from typing import Annotated, Any, Callable, Dict, List, Literal, Optional, Tuple, TypedDict, Union
 
 from pydantic import BaseModel, Field
 
@@ -54,8 +56,11 @@ class CriticFeedback(BaseModel):
     fixes: List[str] = Field(
         default_factory=list, description="Actionable suggestions for improvement"
     )
+    affected_channels: List[str] = Field(
+        default_factory=list, description="Channels whose drafts need revision"
+    )
     passed: bool = Field(
-        description="True if all scores >= 7 and length_ok is True"
+        default=False, description="True if all scores >= 7 and length_ok is True"
     )
 
 
@@ -83,6 +88,14 @@ class AuditLogEntry(BaseModel):
     )
 
 
+class ChunkBatch(TypedDict):
+    """Retrieved chunks stored column-wise: parallel lists, one entry per chunk."""
+
+    ids: List[str]
+    texts: List[str]
+    sources: List[str]
+
+
 class ContentGeneratorState(TypedDict, total=False):
     """State schema for the LangGraph pipeline.
 
@@ -100,8 +113,11 @@ class ContentGeneratorState(TypedDict, total=False):
     relevant_urls: List[Dict[str, str]]  # [{"label": "Register", "url": "https://..."}]
 
     # Retrieved context from RAG
-    brand_chunks: List[Dict[str, Any]]  # List of {"id": str, "text": str, ...}
-    product_chunks: List[Dict[str, Any]]
+    brand_chunks: ChunkBatch
+    product_chunks: ChunkBatch
+    brand_context: str  # brand_chunks formatted for prompts, set by retrieve_node
+    product_context: str  # product_chunks formatted for prompts
+    chunks_text: str  # Both batches formatted together, for the verifier
 
     # Draft content (evolves through iterations)
     drafts: Dict[str, ChannelDraft]
@@ -109,35 +125,62 @@ class ContentGeneratorState(TypedDict, total=False):
     # Quality tracking
     critic_feedback: Optional[CriticFeedback]
     iteration: int
+    unsupported_count: int  # Unsupported claims across all drafts, set by verify_node
 
     # Output
     final_output: Optional[Dict[str, Any]]
-    audit_log: List[Dict[str, Any]]
-    images: Dict[str, Any]  # {"linkedin": PIL.Image or bytes, ...}
+    audit_log: Annotated[List[Dict[str, Any]], operator.add]  # Nodes return only their new entries
+    images: Dict[str, Dict[str, Any]]  # {"linkedin": {"path": str, "size": int, "mime": str}, ...}
+    run_id: str
+
+    # Optional progress hook: (step, streamed text delta), set by the UI runner
+    progress_callback: Optional[Callable[[str, str], None]]
 
 
 # Channel configuration constants
-CHANNEL_CONFIGS = {
-    "linkedin": {
-        "max_length": 3000,
-        "tone": "Professional, thought-leadership",
-        "required_elements": ["Hook", "value prop", "CTA", "hashtags"],
-    },
-    "facebook": {
-        "max_length": 500,
-        "tone": "Conversational, engaging",
-        "required_elements": ["Hook", "benefit", "CTA"],
-    },
-    "email": {
-        "subject_max_length": 60,
-        "body_max_words": 300,
-        "tone": "Direct, personalized",
-        "required_elements": ["Subject", "preheader", "body", "CTA"],
-    },
-    "web": {
-        "headline_max_words": 10,
-        "hero_max_words": 50,
-        "tone": "SEO-friendly, benefit-driven",
-        "required_elements": ["Headline", "subhead", "hero paragraph"],
-    },
+@dataclass(frozen=True, slots=True)
+class LinkedInConfig:
+    """Formatting rules for LinkedIn posts."""
+
+    max_length: int = 3000
+    tone: str = "Professional, thought-leadership"
+    required_elements: Tuple[str, ...] = ("Hook", "value prop", "CTA", "hashtags")
+
+
+@dataclass(frozen=True, slots=True)
+class FacebookConfig:
+    """Formatting rules for Facebook posts."""
+
+    max_length: int = 500
+    tone: str = "Conversational, engaging"
+    required_elements: Tuple[str, ...] = ("Hook", "benefit", "CTA")
+
+
+@dataclass(frozen=True, slots=True)
+class EmailConfig:
+    """Formatting rules for email campaigns."""
+
+    subject_max_length: int = 60
+    body_max_words: int = 300
+    tone: str = "Direct, personalized"
+    required_elements: Tuple[str, ...] = ("Subject", "preheader", "body", "CTA")
+
+
+@dataclass(frozen=True, slots=True)
+class WebConfig:
+    """Formatting rules for web landing page copy."""
+
+    headline_max_words: int = 10
+    hero_max_words: int = 50
+    tone: str = "SEO-friendly, benefit-driven"
+    required_elements: Tuple[str, ...] = ("Headline", "subhead", "hero paragraph")
+
+
+ChannelConfig = Union[LinkedInConfig, FacebookConfig, EmailConfig, WebConfig]
+
+CHANNEL_CONFIGS: Dict[str, ChannelConfig] = {
+    "linkedin": LinkedInConfig(),
+    "facebook": FacebookConfig(),
+    "email": EmailConfig(),
+    "web": WebConfig(),
 }
@@ -0,0 +1,48 @@
+"""Tests for parsing the critic's JSON feedback."""
+
+import json
+
+from src.nodes import critic
+from src.schemas import ChannelDraft
+
+
+def _feedback(**overrides):
+    data = {
+        "brand_voice_score": 8,
+        "cta_clarity_score": 8,
+        "length_ok": True,
+        "issues": [],
+        "fixes": [],
+        "affected_channels": [],
+    }
+    data.update(overrides)
+    return json.dumps(data)
+
+
+def test_passed_may_be_omitted_and_is_derived_from_scores():
+    feedback = critic._parse_critic_response(_feedback(cta_clarity_score=5))
+
+    assert feedback is not None
+    assert not feedback.passed
+
+
+def test_out_of_range_score_is_rejected():
+    assert critic._parse_critic_response(_feedback(brand_voice_score=12)) is None
+
+
+def test_unusable_responses_fail_the_drafts(monkeypatch):
+    responses = iter([_feedback(brand_voice_score=12), "not json"])
+    monkeypatch.setenv("CACHE_DISABLED", "1")
+    monkeypatch.setattr(critic, "get_openai_client", lambda: None)
+    monkeypatch.setattr(
+        critic, "cached_completion", lambda client, on_delta=None, **request: next(responses)
+    )
+    state = {
+        "channels": ["email"],
+        "drafts": {"email": ChannelDraft(channel="email", body="Join us.", cta="Register")},
+    }
+
+    feedback = critic.critic_node(state)["critic_feedback"]
+
+    assert not feedback.passed
+    assert feedback.issues
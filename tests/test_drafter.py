@@ -0,0 +1,50 @@
+"""Tests for choosing channels to re-draft and parsing drafter output."""
+
+import json
+
+from src.nodes.drafter import _channels_to_draft, _parse_batched_draft_response
+from src.schemas import ChannelDraft, CriticFeedback
+
+
+def _state(affected_channels):
+    channels = ["linkedin", "email", "web"]
+    return {
+        "channels": channels,
+        "drafts": {
+            channel: ChannelDraft(channel=channel, body="Join us.", cta="Register")
+            for channel in channels
+        },
+        "critic_feedback": CriticFeedback(
+            brand_voice_score=5,
+            cta_clarity_score=8,
+            length_ok=True,
+            affected_channels=affected_channels,
+        ),
+    }
+
+
+def test_affected_channel_names_are_normalized():
+    assert _channels_to_draft(_state(["LinkedIn", " Email "])) == ["linkedin", "email"]
+
+
+def test_unknown_channel_names_revise_all_channels():
+    assert _channels_to_draft(_state(["Twitter"])) == ["linkedin", "email", "web"]
+
+
+def test_batched_drafts_coerce_non_string_values():
+    response = json.dumps({
+        "linkedin": {
+            "headline": 2026,
+            "body": "Join us in March.",
+            "cta": 42,
+            "claims": [{"text": "Founded 2019", "source_chunk_id": 123}, "bad", {"text": None}],
+        },
+        "email": {"body": {"nested": True}},
+    })
+
+    drafts = _parse_batched_draft_response(["linkedin", "email"], response)
+
+    assert list(drafts) == ["linkedin"]
+    draft = drafts["linkedin"]
+    assert (draft.headline, draft.cta) == ("2026", "42")
+    assert [(c.text, c.source_chunk_id) for c in draft.claims] == [("Founded 2019", "123")]
@@ -0,0 +1,114 @@
+"""Tests for parsing and routing the verifier's claim blocks."""
+
+from types import SimpleNamespace
+
+from src.nodes import verifier
+from src.nodes.verifier import _iter_claims
+from src.schemas import ChannelDraft
+
+FORMATTED_RESPONSE = """**CLAIM:** The platform was founded in 2019
+**SOURCE:** NONE
+**SUPPORTED:** false
+
+---
+
+1. CLAIM: Teams cut review time by 50%
+   SOURCE: chunk_ed531959
+   SUPPORTED: true
+
+- CLAIM: Over 10,000 customers worldwide
+- SOURCE: NONE
+- SUPPORTED: false
+
+CLAIM:
+The event is on January 15, 2026
+SOURCE: user_input
+SUPPORTED: true
+
+SUMMARY:
+Total claims: 4
+"""
+
+
+def test_parses_markdown_and_list_formatted_claims():
+    claims = [claim for _, claim in _iter_claims(FORMATTED_RESPONSE)]
+
+    assert [(c.text, c.source_chunk_id, c.is_supported) for c in claims] == [
+        ("The platform was founded in 2019", None, False),
+        ("Teams cut review time by 50%", "chunk_ed531959", True),
+        ("Over 10,000 customers worldwide", None, False),
+        ("The event is on January 15, 2026", "user_input", True),
+    ]
+
+
+def test_claim_without_source_or_supported_is_unsupported():
+    claims = [claim for _, claim in _iter_claims("**CLAIM:** Ships to 40 countries")]
+
+    assert len(claims) == 1
+    assert not claims[0].is_supported
+
+
+class _FakeCompletions:
+    """Streams canned verifier responses: the batched one, then per-channel ones."""
+
+    def __init__(self, batched: str, single: str):
+        self.batched = batched
+        self.single = single
+        self.prompts = []
+
+    def create(self, **request):
+        prompt = request["messages"][0]["content"]
+        self.prompts.append(prompt)
+        text = self.batched if "===CHANNEL:" in prompt else self.single
+        # A generator, so the verifier can close the stream early
+        return (
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=line))])
+            for line in text.splitlines(keepends=True)
+        )
+
+
+def _state(drafts):
+    return {"drafts": drafts, "chunks_text": "", "event_title": "Launch webinar"}
+
+
+def test_untagged_batched_claims_fall_back_to_per_channel_verification(monkeypatch):
+    untagged = "CLAIM: The platform was founded in 2019\nSOURCE: NONE\nSUPPORTED: false\n"
+    completions = _FakeCompletions(batched=untagged, single=untagged)
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    monkeypatch.setattr(verifier, "get_openai_client", lambda: client)
+    drafts = {
+        channel: ChannelDraft(channel=channel, body="Founded in 2019.", cta="Join")
+        for channel in ("linkedin", "email")
+    }
+
+    update = verifier.verify_node(_state(drafts))
+
+    # One batched call, then one call per channel
+    assert len(completions.prompts) == 3
+    assert update["unsupported_count"] == 2
+    assert all(not draft.claims[0].is_supported for draft in update["drafts"].values())
+
+
+def test_early_exit_rechecks_channels_the_batch_never_reached(monkeypatch):
+    batched = (
+        "CHANNEL: linkedin\n"
+        "CLAIM: The platform was founded in 2019\nSOURCE: NONE\nSUPPORTED: false\n\n"
+        "CHANNEL: email\n"
+        "CLAIM: Over 10,000 customers worldwide\nSOURCE: NONE\nSUPPORTED: false\n"
+    )
+    single = "CLAIM: Over 10,000 customers worldwide\nSOURCE: NONE\nSUPPORTED: false\n"
+    completions = _FakeCompletions(batched=batched, single=single)
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    monkeypatch.setattr(verifier, "get_openai_client", lambda: client)
+    monkeypatch.setenv("VERIFIER_EARLY_EXIT", "true")
+    drafts = {
+        channel: ChannelDraft(channel=channel, body="Founded in 2019.", cta="Join")
+        for channel in ("linkedin", "email")
+    }
+
+    update = verifier.verify_node(_state(drafts))
+
+    # The batch stops at linkedin's unsupported claim; email is verified on its own
+    assert len(completions.prompts) == 2
+    assert update["unsupported_count"] == 2
+    assert update["drafts"]["email"].claims[0].text == "Over 10,000 customers worldwide"